@@ -0,0 +1,22 @@
+import importlib
+
+
+DATABASE_MANAGER_MODULE = "algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.management.database_manager"
+
+
+def _database_manager():
+    return importlib.import_module(DATABASE_MANAGER_MODULE)
+
+
+def get_engine():
+    """
+    Return database_manager's engine, the one pool every repository shares.
+    Resolved on first use, so importing a scan repository does not touch the database layer;
+    pool size and SQL echo are configured in database_manager only.
+    """
+    return _database_manager().engine
+
+
+def get_db_session():
+    """Dependency to get a database session from database_manager's session factory."""
+    yield from _database_manager().get_db_session()
@@ -0,0 +1,85 @@
+import os
+import time
+import threading
+import logging
+from contextlib import contextmanager
+
+from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.management.database_manager import get_db_session
+
+logger = logging.getLogger(__name__)
+
+# Checkouts slower than this are logged as a sign the connection pool is too small
+SLOW_CHECKOUT_SECONDS = float(os.getenv("DB_SLOW_CHECKOUT_SECONDS", "0.5"))
+
+
+class CheckoutStats:
+    """Thread-safe counters for how long units of work waited for a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+            self.slow_checkouts = 0
+            self.in_use = 0
+
+    def record(self, wait: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.in_use += 1
+            if wait >= SLOW_CHECKOUT_SECONDS:
+                self.slow_checkouts += 1
+
+    def release(self):
+        with self._lock:
+            self.in_use -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "in_use": self.in_use,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 2) if self.checkouts else None,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "slow_checkouts": self.slow_checkouts,
+                "slow_threshold_ms": SLOW_CHECKOUT_SECONDS * 1000,
+            }
+
+
+checkout_stats = CheckoutStats()
+
+
+@contextmanager
+def unit_of_work(session_factory=get_db_session, commit: bool = True):
+    """
+    Check out a session and its connection for one operation, commit when the block succeeds
+    (unless `commit` is False), roll back when it raises, and always return the connection.
+    The time spent waiting for the pooled connection is recorded in `checkout_stats`.
+    """
+    started = time.perf_counter()
+    session = next(session_factory())
+    try:
+        session.connection()  # check out now so the pool wait is measured here, not in the first query
+    except Exception:
+        session.close()
+        raise
+    wait = time.perf_counter() - started
+    checkout_stats.record(wait)
+    if wait >= SLOW_CHECKOUT_SECONDS:
+        logger.warning(f"⏳ Waited {wait:.3f}s for a database connection")
+    try:
+        yield session
+        if commit:
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+        checkout_stats.release()
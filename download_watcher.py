@@ -0,0 +1,40 @@
+import os
+import time
+
+DOWNLOAD_TIMEOUT_SECONDS = float(os.getenv("SCREENER_DOWNLOAD_TIMEOUT", "60"))
+DOWNLOAD_POLL_INTERVAL_SECONDS = 0.2
+# Number of consecutive polls the file size must stay unchanged before it is considered complete
+DOWNLOAD_STABLE_POLLS = 1
+
+
+def wait_for_download(download_dir, file_name, logger, timeout=DOWNLOAD_TIMEOUT_SECONDS,
+                      poll_interval=DOWNLOAD_POLL_INTERVAL_SECONDS, stable_polls=DOWNLOAD_STABLE_POLLS):
+    """
+    Block until Chrome has finished writing `file_name` into `download_dir` and return its path.
+    A download is complete once the `.crdownload` partial file is gone and the final file's size
+    has stayed the same for `stable_polls` polls. Raises TimeoutError after `timeout` seconds.
+    """
+    path = os.path.join(download_dir, file_name)
+    partial_path = f"{path}.crdownload"
+    started = time.perf_counter()
+    deadline = started + timeout
+    last_size = None
+    stable_count = 0
+
+    while time.perf_counter() < deadline:
+        if os.path.exists(path) and not os.path.exists(partial_path):
+            size = os.path.getsize(path)
+            if size > 0 and size == last_size:
+                stable_count += 1
+                if stable_count >= stable_polls:
+                    latency = time.perf_counter() - started
+                    logger.info(f"📥 Download of {file_name} completed in {latency:.2f}s ({size} bytes)")
+                    return path
+            else:
+                stable_count = 0
+            last_size = size
+        time.sleep(poll_interval)
+
+    state = "partial file still present" if os.path.exists(partial_path) else "file not found"
+    logger.error(f"Error: download of {file_name} not complete after {timeout:g}s ({state})")
+    raise TimeoutError(f"Download of {file_name} did not complete within {timeout:g}s")
@@ -0,0 +1,168 @@
+import os
+import sys
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Fyers rejects quote requests with more than 50 symbols
+FYERS_QUOTES_CHUNK_SIZE = int(os.getenv("FYERS_QUOTES_CHUNK_SIZE", "50"))
+FYERS_QUOTES_WORKERS = int(os.getenv("FYERS_QUOTES_WORKERS", "4"))
+# Extra attempts per chunk after the first one fails
+FYERS_QUOTES_RETRIES = int(os.getenv("FYERS_QUOTES_RETRIES", "2"))
+FYERS_QUOTES_RETRY_BACKOFF = float(os.getenv("FYERS_QUOTES_RETRY_BACKOFF", "0.25"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the shared chunk-fetch thread pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=FYERS_QUOTES_WORKERS, thread_name_prefix="fyers-quotes")
+        return _executor
+
+
+def get_fyers_client():
+    """Return the process-wide FyersModel built from FYERS_ACCESS_TOKEN / FYERS_CLIENT_ID."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            from fyers_apiv3 import fyersModel
+            _client = fyersModel.FyersModel(
+                token=os.getenv("FYERS_ACCESS_TOKEN"),
+                is_async=False,
+                client_id=os.getenv("FYERS_CLIENT_ID"),
+                log_path=".",
+            )
+        return _client
+
+
+def to_fyers_symbol(symbol: str) -> str:
+    """"sbin" -> "NSE:SBIN-EQ"; symbols already in exchange form are passed through."""
+    return symbol if ":" in symbol else f"NSE:{symbol.upper()}-EQ"
+
+
+def _fetch_chunk(client, chunk, logger, retries: int):
+    data = {"symbols": ",".join(chunk)}
+    for attempt in range(retries + 1):
+        try:
+            response = client.quotes(data)
+            logger.debug(f"Quotes response for {len(chunk)} symbols: {response}")
+            if response.get("s") == "ok":
+                return response.get("d", [])
+            error = response.get("message", "Unknown error")
+        except Exception as e:
+            error = e
+        if attempt < retries:
+            time.sleep(FYERS_QUOTES_RETRY_BACKOFF * (2 ** attempt))
+    logger.error(f"Fyers API error for {len(chunk)} symbols after {retries + 1} attempts: {error}")
+    return None
+
+
+def fetch_quotes(client, symbols, logger, chunk_size: int = FYERS_QUOTES_CHUNK_SIZE,
+                 retries: int = FYERS_QUOTES_RETRIES):
+    """
+    Fetch quotes for any number of symbols, split into chunks under the broker's per-request limit
+    and requested concurrently. Failed chunks are retried on their own.
+    Returns a response shaped like client.quotes() ({"s": "ok", "d": [...]}) with the quotes of
+    every chunk that succeeded, or None if none did. When only some chunks failed, their symbols
+    are listed under "failed" so callers can tell the data is partial.
+    """
+    fyers_symbols = list(dict.fromkeys(to_fyers_symbol(s) for s in symbols))
+    if not fyers_symbols:
+        return {"s": "ok", "d": []}
+    chunks = [fyers_symbols[i:i + chunk_size] for i in range(0, len(fyers_symbols), chunk_size)]
+    logger.info(f"Fetching quotes for {len(fyers_symbols)} symbols in {len(chunks)} chunk(s)")
+
+    started = time.perf_counter()
+    results = list(_get_executor().map(lambda chunk: _fetch_chunk(client, chunk, logger, retries), chunks))
+    quotes = [quote for result in results if result for quote in result]
+    failed_chunks = [chunk for chunk, result in zip(chunks, results) if result is None]
+    logger.info(f"Fetched {len(quotes)} quotes in {time.perf_counter() - started:.3f}s"
+                + (f" ({len(failed_chunks)} chunk(s) failed)" if failed_chunks else ""))
+
+    if len(failed_chunks) == len(chunks):
+        return None
+    response = {"s": "ok", "d": quotes}
+    if failed_chunks:
+        response["failed"] = [symbol for chunk in failed_chunks for symbol in chunk]
+    return response
+
+
+class StubQuotesClient:
+    """
+    Local stand-in for fyersModel.FyersModel.quotes with the same request/response shape.
+    Prices are derived from the symbol, so repeated calls agree; latency, the per-request symbol
+    limit and a failure rate can be set to exercise chunking and retries.
+    """
+
+    def __init__(self, latency: float = 0.05, max_symbols: int = FYERS_QUOTES_CHUNK_SIZE,
+                 failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.max_symbols = max_symbols
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    def quotes(self, data):
+        self.calls += 1
+        symbols = [s for s in data["symbols"].split(",") if s]
+        time.sleep(self.latency)
+        if len(symbols) > self.max_symbols:
+            return {"s": "error", "message": f"Too many symbols ({len(symbols)} > {self.max_symbols})"}
+        if self._random.random() < self.failure_rate:
+            return {"s": "error", "message": "Stub failure"}
+        quotes = []
+        for symbol in symbols:
+            prev_close = 100 + sum(map(ord, symbol)) % 900
+            ltp = round(prev_close * 1.01, 2)
+            quotes.append({
+                "n": symbol,
+                "s": "ok",
+                "v": {"lp": ltp, "prev_close_price": prev_close, "chp": round((ltp - prev_close) / prev_close * 100, 2)},
+            })
+        return {"s": "ok", "d": quotes}
+
+
+def benchmark_quotes(symbol_counts=(10, 50, 200, 500), latency: float = 0.05, failure_rate: float = 0.1):
+    """
+    Compare one sequential call per chunk against the concurrent fetcher on the stub client.
+    Both paths see the same stub failure rate and retry failed chunks the same way.
+    """
+    bench_logger = logging.getLogger("fyers-quotes-bench")
+    bench_logger.setLevel(logging.WARNING)
+    for count in symbol_counts:
+        symbols = [f"STOCK{i}" for i in range(count)]
+
+        fyers_symbols = [to_fyers_symbol(s) for s in symbols]
+
+        client = StubQuotesClient(latency=latency, failure_rate=failure_rate)
+        started = time.perf_counter()
+        for i in range(0, count, FYERS_QUOTES_CHUNK_SIZE):
+            _fetch_chunk(client, fyers_symbols[i:i + FYERS_QUOTES_CHUNK_SIZE], bench_logger, FYERS_QUOTES_RETRIES)
+        sequential, sequential_calls = time.perf_counter() - started, client.calls
+
+        client = StubQuotesClient(latency=latency, failure_rate=failure_rate)
+        started = time.perf_counter()
+        response = fetch_quotes(client, symbols, bench_logger)
+        concurrent = time.perf_counter() - started
+        print(f"{count:>4} symbols: sequential {sequential * 1000:.0f} ms ({sequential_calls} calls), "
+              f"concurrent {concurrent * 1000:.0f} ms ({client.calls} calls, "
+              f"{len(response['d']) if response else 0} quotes) at {failure_rate:.0%} stub failures")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_quotes()
+    else:
+        print(fetch_quotes(StubQuotesClient(), ["SBIN", "RELIANCE"], logger))
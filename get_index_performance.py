@@ -6,11 +6,11 @@ logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 # from algo_scripts.algotrade.scripts.trading_style.intraday.strategies.scalping_915.scalp_src.update_nse_index import \
 #     write_nse_to_db
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select,WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
+import sys
 import time
 import re
 from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.market_context.index_snapshot import \
@@ -19,7 +19,11 @@ from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.m
 from algo_scripts.algotrade.scripts.trade_utils.time_manager import get_current_ist_time_as_str, get_today_date_as_str
 from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.management.database_manager import \
     get_db_session
-from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.market_context.index_master import IndexMasterRepository
+from webdriver_pool import get_driver_pool
+from index_symbol_cache import get_index_symbol_cache
+from intraday_screener_http import use_http_fetch, fetch_index_performance
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 
 # 1) Configure the root logger (you can skip this and configure your named logger directly if you prefer)
 logging.basicConfig(
@@ -27,166 +31,319 @@ logging.basicConfig(
     format="%(asctime)s %(name)s %(levelname)s: %(message)s",
 )
 
+ADVANCES_XPATH = "/html/body/app-root/div/app-home-layout/div[2]/app-dashboard/div/div[2]/div[1]/div/div/div[2]/div[1]/div/div[2]/div[1]/span"
+DECLINES_XPATH = "/html/body/app-root/div/app-home-layout/div[2]/app-dashboard/div/div[2]/div[1]/div/div/div[2]/div[1]/div/div[2]/div[1]/span/span"
+DROPDOWN_XPATH = "/html/body/app-root/div/app-home-layout/div[2]/app-dashboard/div/div[2]/div[1]/div/div/div[2]/div[1]/div/div[2]/div[1]/select"
+
 def job():
     logger = logging.getLogger("FallbackLogger")
     load_index_performance_to_db(logger)
 
 def load_index_performance_to_db(logger, max_retries: int = 3, backoff: int = 5):
-    run_delete_snapshots_for_today(logger)
     logger.info(f"🔄 Started load_index_performance_to_db at  " + get_current_ist_time_as_str())
     URL = "https://intradayscreener.com/stock-market-today"
     last_exc = None
 
+    if use_http_fetch():
+        try:
+            merged_data = fetch_index_performance(logger)
+        except Exception as e:
+            logger.warning(f"⚠️ HTTP fetch failed ({e}); falling back to browser scrape")
+        else:
+            logger.info("✅ HTTP fetch successful")
+            write_to_db(logger, merged_data)
+            return
+
     for attempt in range(1, max_retries + 1):
         logger.info(f"🔄 Scrape attempt {attempt}/{max_retries}")
-        chrome_options = webdriver.ChromeOptions()
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.set_window_size(1920, 1080)
-        wait = WebDriverWait(driver, 15)
-        logger.info(f"🔄 Chrome Parameters loaded")
-
         try:
-            # --- Retry the initial page load ---
-            for load_try in range(1, max_retries + 1):
+            with get_driver_pool().driver() as driver:
+                wait = WebDriverWait(driver, 15)
+                logger.info(f"🔄 Chrome driver checked out from pool")
+
+                # --- Retry the initial page load ---
+                for load_try in range(1, max_retries + 1):
+                    try:
+                        driver.get(URL)
+                        break
+                    except WebDriverException as we:
+                        logger.info("WebDriverException")
+                        last_exc = we
+                        msg = (
+                                f"⏱️ driver.get() attempt {load_try}/{max_retries} failed: {we}"
+                                + (" — retrying…" if load_try < max_retries else " — giving up on load")
+                        )
+                        logger.warning(msg)
+                        if load_try == max_retries:
+                            raise
+                        time.sleep(backoff)
+                        # Hardcoded XPath data (from your input)
+                xpath_data = [
+                    {"name": "NIFTY 50", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[1]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[1]/span[4]"},
+                    {"name": "GIFT NIFTY", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[2]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[2]/span[4]"},
+                    {"name": "NIFTY BANK", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[3]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[3]/span[4]"},
+                    {"name": "NIFTY_MIDCAP_100", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[4]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[4]/span[4]"},
+                    {"name": "NIFTY_SMLCAP_100", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[5]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[5]/span[4]"},
+                    {"name": "NIFTY_FIN_SERVICE", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[6]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[6]/span[4]"},
+                    {"name": "INDIA_VIX", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[7]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[7]/span[4]"},
+                    {"name": "SENSEX", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[8]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[8]/span[4]"}
+
+                ]
+
+                # Wait once for the panel to render, then read every index in one round trip
+                phase_started = time.perf_counter()
                 try:
-                    driver.get(URL)
-                    break
-                except WebDriverException as we:
-                    logger.info("WebDriverException")
-                    last_exc = we
-                    msg = (
-                            f"⏱️ driver.get() attempt {load_try}/{max_retries} failed: {we}"
-                            + (" — retrying…" if load_try < max_retries else " — giving up on load")
+                    wait.until(EC.presence_of_element_located((By.XPATH, xpath_data[0]["value_xpath"])))
+                except TimeoutException as e:
+                    logger.info(f"❌ Index panel did not render: {e}")
+                logger.info(f"⏱️ Index panel rendered in {time.perf_counter() - phase_started:.3f}s")
+
+                phase_started = time.perf_counter()
+                results = extract_index_panel(driver, xpath_data, logger)
+                logger.info(f"⏱️ Index panel extracted in {time.perf_counter() - phase_started:.3f}s")
+
+                # XPaths
+                advances_xpath, declines_xpath, dropdown_xpath = ADVANCES_XPATH, DECLINES_XPATH, DROPDOWN_XPATH
+
+                # Wait for the dropdown to render
+                wait.until(EC.presence_of_element_located((By.XPATH, dropdown_xpath)))
+
+                # Scrape data - advances declines
+                phase_started = time.perf_counter()
+                adv_decline_records = collect_advance_decline(driver, wait, dropdown_xpath, advances_xpath, declines_xpath, logger)
+
+                logger.info(str(adv_decline_records))
+                logger.info(f"⏱️ Advance/decline collected in {time.perf_counter() - phase_started:.3f}s")
+
+                # build a map: index name → (advances, declines)
+                adv_decl_map = {
+                    rec["Index"]: (rec["Advances"], rec["Declines"])
+                    for rec in adv_decline_records
+                }
+                all_names = {r[0] for r in results} | {rec["Index"] for rec in adv_decline_records}
+                merged_data = []
+                for name in all_names:
+                    # find value/percent if we scraped it, else default
+                    value, pct = next(
+                        ((v,p) for n,v,p in results if n == name),
+                        (0, 0)
                     )
-                    logger.warning(msg)
-                    if load_try == max_retries:
-                        raise
-                    time.sleep(backoff)
-                    # Hardcoded XPath data (from your input)
-            xpath_data = [
-                {"name": "NIFTY 50", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[1]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[1]/span[4]"},
-                {"name": "GIFT NIFTY", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[2]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[2]/span[4]"},
-                {"name": "NIFTY BANK", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[3]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[3]/span[4]"},
-                {"name": "NIFTY_MIDCAP_100", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[4]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[4]/span[4]"},
-                {"name": "NIFTY_SMLCAP_100", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[5]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[5]/span[4]"},
-                {"name": "NIFTY_FIN_SERVICE", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[6]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[6]/span[4]"},
-                {"name": "INDIA_VIX", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[7]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[7]/span[4]"},
-                {"name": "SENSEX", "value_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[8]/span[2]", "percent_xpath": "/html/body/app-root/div/app-home-layout/div[1]/app-index-panel/div/div[1]/span[8]/span[4]"}
-
-            ]
-
-            # Results list
-            results = []
-
-            for entry in xpath_data:
-                name = entry["name"]
-                logger.info(f"Extracting {name}")
-                try:
-                    value = wait.until(EC.presence_of_element_located((By.XPATH, entry["value_xpath"]))).text.strip()
-                    logger.info(f"Extracting {value}")
-                    raw_pct = driver.find_element(By.XPATH, entry["percent_xpath"]).text.strip()
-                    percent = re.sub(r"[()%]", "", raw_pct)
-                    logger.info(f"Extracting {percent}")
-                    results.append([name, value, percent])
-                except Exception as e:
-                    logger.info(f"❌ Failed to extract {name}: {e}")
-                    results.append([name, "N/A", "N/A"])
-
-            # XPaths
-            advances_xpath = "/html/body/app-root/div/app-home-layout/div[2]/app-dashboard/div/div[2]/div[1]/div/div/div[2]/div[1]/div/div[2]/div[1]/span"
-            declines_xpath = "/html/body/app-root/div/app-home-layout/div[2]/app-dashboard/div/div[2]/div[1]/div/div/div[2]/div[1]/div/div[2]/div[1]/span/span"
-            dropdown_xpath = "/html/body/app-root/div/app-home-layout/div[2]/app-dashboard/div/div[2]/div[1]/div/div/div[2]/div[1]/div/div[2]/div[1]/select"
-
-            # Get dropdown options
-            dropdown_element = wait.until(EC.presence_of_element_located((By.XPATH, dropdown_xpath)))
-            dropdown = Select(dropdown_element)
-
-            # Scrape data - advances declines
-            adv_decline_records = []
-            for i in range(len(dropdown.options)):
-                dropdown.select_by_index(i)
-                time.sleep(2)
-                index_name = dropdown.options[i].text.strip()
-                logger.info(str(index_name))
-                adv, dec = get_advance_decline(wait,advances_xpath,declines_xpath,logger)
-                adv_decline_records.append({"Index": index_name, "Advances": adv, "Declines": dec})
-
-            logger.info(str(adv_decline_records))
-
-            # build a map: index name → (advances, declines)
-            adv_decl_map = {
-                rec["Index"]: (rec["Advances"], rec["Declines"])
-                for rec in adv_decline_records
-            }
-            all_names = {r[0] for r in results} | {rec["Index"] for rec in adv_decline_records}
-            merged_data = []
-            for name in all_names:
-                # find value/percent if we scraped it, else default
-                value, pct = next(
-                    ((v,p) for n,v,p in results if n == name),
-                    (0, 0)
-                )
-                # find adv/dec if we have it, else default
-                adv, dec = adv_decl_map.get(name, (0,0))
-                merged_data.append([name, value, pct, adv, dec])
+                    # find adv/dec if we have it, else default
+                    adv, dec = adv_decl_map.get(name, (0,0))
+                    merged_data.append([name, value, pct, adv, dec])
 
-            logger.info(str(merged_data))
+                logger.info(str(merged_data))
 
-            # # Save to CSV
-            # output_file = "index_data_extracted.csv"
-            # with open(output_file, "w", newline="", encoding="utf-8") as f:
-            #     writer = csv.writer(f)
-            #     writer.writerow(["name", "value", "percentage"])
-            #     writer.writerows(results)
-            #logger.info(f"✅ Done. Saved to: {output_file}")
+                # # Save to CSV
+                # output_file = "index_data_extracted.csv"
+                # with open(output_file, "w", newline="", encoding="utf-8") as f:
+                #     writer = csv.writer(f)
+                #     writer.writerow(["name", "value", "percentage"])
+                #     writer.writerows(results)
+                #logger.info(f"✅ Done. Saved to: {output_file}")
 
-            logger.info("✅ Scrape successful")
-            write_to_db(logger, merged_data)
-            #write_nse_to_db()
+                logger.info("✅ Scrape successful")
+                phase_started = time.perf_counter()
+                write_to_db(logger, merged_data)
+                logger.info(f"⏱️ Snapshots written in {time.perf_counter() - phase_started:.3f}s")
+                #write_nse_to_db()
 
-            return  # exit on first successful attempt
+                return  # exit on first successful attempt
 
 
-        except (TimeoutException, WebDriverException) as e:
+        except (TimeoutException, WebDriverException, ValueError) as e:
+            # ValueError: breadth text that never became a number
             last_exc = e
             logger.warning(f"⚠️ Attempt {attempt} failed: {e}. Retrying in {backoff}s…")
             time.sleep(backoff)
 
-        finally:
-            try:
-                driver.quit()
-            except Exception:
-                pass
-
     # if we get here, all retries failed
     logger.error(f"❌ All {max_retries} attempts failed, aborting.")
     raise last_exc
 
-def get_advance_decline(wait,advances_xpath,declines_xpath,logger):
-    full_text = wait.until(EC.presence_of_element_located((By.XPATH, advances_xpath))).text.strip()
-    logger.info(f"Scraped raw text: {full_text}")
+# Reads the value and percent text of every panel entry; a missing node yields null for that field only
+INDEX_PANEL_JS = """
+const read = (xpath) => {
+    const node = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return node ? node.innerText.trim() : null;
+};
+return arguments[0].map(entry => ({
+    name: entry.name,
+    value: read(entry.value_xpath),
+    percent: read(entry.percent_xpath),
+}));
+"""
+
+def extract_index_panel(driver, xpath_data, logger):
+    """
+    Pull every index name, value and percent from the panel in a single execute_script call.
+    Fields the script could not read fall back to an individual find_element, then to "N/A".
+    """
+    try:
+        extracted = driver.execute_script(INDEX_PANEL_JS, xpath_data) or []
+    except WebDriverException as e:
+        logger.info(f"❌ Bulk panel extraction failed, reading fields one by one: {e}")
+        extracted = []
+    extracted_by_name = {item.get("name"): item for item in extracted}
+
+    results = []
+    for entry in xpath_data:
+        name = entry["name"]
+        item = extracted_by_name.get(name, {})
+        value = item.get("value") or read_xpath_text(driver, entry["value_xpath"], name, logger)
+        raw_pct = item.get("percent") or read_xpath_text(driver, entry["percent_xpath"], name, logger)
+        percent = re.sub(r"[()%]", "", raw_pct) if raw_pct != "N/A" else raw_pct
+        logger.info(f"Extracted {name}: {value} ({percent})")
+        results.append([name, value, percent])
+    return results
+
+def read_xpath_text(driver, xpath, name, logger):
+    try:
+        return driver.find_element(By.XPATH, xpath).text.strip()
+    except Exception as e:
+        logger.info(f"❌ Failed to extract {name}: {e}")
+        return "N/A"
+
+# Longest we wait for the advance/decline text to change after selecting an index
+ADVANCE_DECLINE_OPTION_TIMEOUT = 3
+
+# Selects every dropdown option in turn inside the page and returns as soon as the breadth text changes
+ADVANCE_DECLINE_JS = """
+const [selectXpath, advancesXpath, declinesXpath, optionTimeoutMs, done] = arguments;
+const byXpath = (xpath) => document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const text = (xpath) => { const node = byXpath(xpath); return node ? node.innerText.trim() : null; };
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+const select = byXpath(selectXpath);
+if (!select) { done(null); return; }
+(async () => {
+    const records = [];
+    for (let i = 0; i < select.options.length; i++) {
+        const started = performance.now();
+        const before = text(advancesXpath);
+        if (select.selectedIndex !== i) {
+            select.selectedIndex = i;
+            select.dispatchEvent(new Event("change", {bubbles: true}));
+            while (text(advancesXpath) === before && performance.now() - started < optionTimeoutMs) {
+                await sleep(20);
+            }
+        }
+        records.push({
+            index: select.options[i].text.trim(),
+            advances: text(advancesXpath),
+            declines: text(declinesXpath),
+            elapsed_ms: performance.now() - started,
+        });
+    }
+    done(records);
+})().catch(() => done(null));
+"""
+
+def collect_advance_decline(driver, wait, dropdown_xpath, advances_xpath, declines_xpath, logger):
+    """
+    Collect advances/declines for every index in the dropdown.
+    Runs the whole loop inside the page in one async script call; if that is unavailable,
+    falls back to selecting options from Python and waiting only until the text changes.
+    """
+    option_count = len(Select(driver.find_element(By.XPATH, dropdown_xpath)).options)
+    # The driver goes back to the pool afterwards, so put its script timeout back as we found it
+    previous_script_timeout = driver.timeouts.script
+    try:
+        driver.set_script_timeout(option_count * ADVANCE_DECLINE_OPTION_TIMEOUT + 10)
+        scripted = driver.execute_async_script(
+            ADVANCE_DECLINE_JS, dropdown_xpath, advances_xpath, declines_xpath, ADVANCE_DECLINE_OPTION_TIMEOUT * 1000
+        )
+    except WebDriverException as e:
+        logger.info(f"❌ In-page advance/decline collection failed: {e}")
+        scripted = None
+    finally:
+        driver.set_script_timeout(previous_script_timeout)
+
+    if scripted:
+        try:
+            adv_decline_records = []
+            for record in scripted:
+                adv, dec = parse_advance_decline(record["advances"] or "", record["declines"] or "")
+                logger.info(f"{record['index']}: {adv}/{dec} in {record['elapsed_ms']:.0f} ms")
+                adv_decline_records.append({"Index": record["index"], "Advances": adv, "Declines": dec})
+            return adv_decline_records
+        except ValueError as e:
+            logger.info(f"❌ In-page advance/decline text was not numeric ({e}); reading options one by one")
+
+    return collect_advance_decline_by_option(driver, wait, dropdown_xpath, advances_xpath, declines_xpath, logger)
+
+def collect_advance_decline_by_option(driver, wait, dropdown_xpath, advances_xpath, declines_xpath, logger):
+    """Select each option from Python, waiting for the breadth text to change instead of sleeping."""
+    dropdown = Select(wait.until(EC.presence_of_element_located((By.XPATH, dropdown_xpath))))
+    adv_decline_records = []
+    for i in range(len(dropdown.options)):
+        option_started = time.perf_counter()
+        previous_text = driver.find_element(By.XPATH, advances_xpath).text.strip()
+        if not dropdown.options[i].is_selected():
+            dropdown.select_by_index(i)
+            try:
+                WebDriverWait(driver, ADVANCE_DECLINE_OPTION_TIMEOUT, poll_frequency=0.05).until(
+                    lambda d: d.find_element(By.XPATH, advances_xpath).text.strip() != previous_text
+                )
+            except TimeoutException:
+                # Consecutive indices can genuinely share the same breadth numbers
+                pass
+        index_name = dropdown.options[i].text.strip()
+        adv, dec = get_advance_decline(wait,advances_xpath,declines_xpath,logger)
+        logger.info(f"{index_name}: {adv}/{dec} in {(time.perf_counter() - option_started) * 1000:.0f} ms")
+        adv_decline_records.append({"Index": index_name, "Advances": adv, "Declines": dec})
+    return adv_decline_records
+
+def parse_advance_decline(full_text, declines_text):
     if "|" in full_text:
         adv, dec = [val.strip() for val in full_text.split("|")]
     else:
-        adv = wait.until(EC.presence_of_element_located((By.XPATH, advances_xpath))).text.strip()
-        dec = wait.until(EC.presence_of_element_located((By.XPATH, declines_xpath))).text.strip()
+        adv, dec = full_text, declines_text
     return int(adv), int(dec)
 
+def get_advance_decline(wait,advances_xpath,declines_xpath,logger):
+    """Wait until the breadth text parses as numbers; raises TimeoutException if it never does."""
+    def parsed(driver):
+        full_text = driver.find_element(By.XPATH, advances_xpath).text.strip()
+        declines_text = "" if "|" in full_text else driver.find_element(By.XPATH, declines_xpath).text.strip()
+        try:
+            return parse_advance_decline(full_text, declines_text)
+        except ValueError:
+            logger.info(f"Scraped raw text not numeric yet: {full_text!r}")
+            return False
+    return wait.until(parsed)
+
+def benchmark_advance_decline(url, logger, rounds: int = 3):
+    """
+    Time both advance/decline collection paths against `url`, typically a recorded page
+    replayed by intraday_screener_fixture_server, and log the time per dropdown option.
+    """
+    advances_xpath, declines_xpath, dropdown_xpath = ADVANCES_XPATH, DECLINES_XPATH, DROPDOWN_XPATH
+    with get_driver_pool().driver() as driver:
+        wait = WebDriverWait(driver, 15)
+        for name, collect in (("in-page", collect_advance_decline), ("per-option", collect_advance_decline_by_option)):
+            for run in range(1, rounds + 1):
+                driver.get(url)
+                wait.until(EC.presence_of_element_located((By.XPATH, dropdown_xpath)))
+                started = time.perf_counter()
+                records = collect(driver, wait, dropdown_xpath, advances_xpath, declines_xpath, logger)
+                elapsed = time.perf_counter() - started
+                per_option = elapsed / len(records) * 1000 if records else 0
+                logger.info(f"⏱️ {name} run {run}: {len(records)} options in {elapsed:.2f}s ({per_option:.0f} ms/option)")
+
 def write_to_db(logger, data):
     """
-    data: List of [name, value_str, percent_str] as returned from load_index_performance_to_db
+    data: List of [name, value_str, percent_str, advances, declines] as returned from load_index_performance_to_db
+    Upserts today's snapshot per index in a single statement, so readers never see an empty window.
     """
     logger.info("Writing to DB " + get_current_ist_time_as_str())
     session = next(get_db_session())
-    idx_repo = IndexMasterRepository(session)
+    symbol_cache = get_index_symbol_cache()
+    index_ids = symbol_cache.resolve(session, [row[0] for row in data])
 
     snapshots = []
     for name, value_str, percent_str,advance,decline in data:
-        master = idx_repo.get_index_by_symbol(name)
-        if not master:
+        index_id = index_ids.get(name)
+        if index_id is None:
             logger.warning(f"No IndexMaster found for '{name}', skipping insert.")
             continue
 
@@ -200,26 +357,103 @@ def write_to_db(logger, data):
             logger.warning(f"Parsing numeric fields for '{name}' failed ({e}); defaulting value & percent to 0.0")
             value, percent = 0.0, 0.0
 
-        # build snapshot instance
-        snapshot = IndexSnapshot(
-            index_id = master.index_id,
-            index_value              = value,
-            percent_change  = percent,
-            snapshot_date = get_today_date_as_str(),
-            total_advancing = advance,
-            total_declining = decline
+        # build snapshot row
+        snapshots.append({
+            "index_id": index_id,
+            "index_value": value,
+            "percent_change": percent,
+            "snapshot_date": get_today_date_as_str(),
+            "total_advancing": advance,
+            "total_declining": decline,
+        })
 
-        )
-        snapshots.append(snapshot)
+    try:
+        if not snapshots:
+            logger.info("⚠️ No snapshots to insert.")
+        elif snapshot_unique_key_exists(session, logger):
+            stmt = mysql_insert(IndexSnapshot).values(snapshots)
+            stmt = stmt.on_duplicate_key_update(
+                index_value=stmt.inserted.index_value,
+                percent_change=stmt.inserted.percent_change,
+                total_advancing=stmt.inserted.total_advancing,
+                total_declining=stmt.inserted.total_declining,
+            )
+            session.execute(stmt)
+            session.commit()
+            logger.info(f"✅ Upserted {len(snapshots)} index performance snapshots." + get_current_ist_time_as_str())
+        else:
+            # Without the unique key an upsert would duplicate rows; replace today's rows in one transaction instead.
+            # The delete is issued here rather than through IndexSnapshotRepository so nothing commits in between.
+            session.query(IndexSnapshot).filter(
+                IndexSnapshot.snapshot_date == get_today_date_as_str()
+            ).delete(synchronize_session=False)
+            session.bulk_insert_mappings(IndexSnapshot, snapshots)
+            session.commit()
+            logger.info(f"✅ Replaced {len(snapshots)} index performance snapshots." + get_current_ist_time_as_str())
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
 
-    if snapshots:
-        session.bulk_save_objects(snapshots)
-        session.commit()
-        logger.info(f"✅ Inserted {len(snapshots)} index performance snapshots." + get_current_ist_time_as_str())
-    else:
-        logger.info("⚠️ No snapshots to insert.")
+# Upserts are keyed on one snapshot per index per day
+SNAPSHOT_UNIQUE_KEY_NAME = "uq_index_snapshot_index_date"
+SNAPSHOT_KEY_COLUMNS = ("index_id", "snapshot_date")
+_snapshot_unique_key_exists = None
 
-    session.close()
+def _has_snapshot_unique_key(bind) -> bool:
+    return any(
+        index["unique"] and tuple(index["column_names"]) == SNAPSHOT_KEY_COLUMNS
+        for index in inspect(bind).get_indexes(IndexSnapshot.__tablename__)
+    )
+
+def snapshot_unique_key_exists(session, logger) -> bool:
+    """
+    Whether the (index_id, snapshot_date) unique key the upsert relies on is in place.
+    Looked up once per process; a missing key (or a failed lookup) is remembered too, so writes
+    stay on delete-and-insert until migrate_snapshot_unique_key has run and the loader restarts.
+    """
+    global _snapshot_unique_key_exists
+    if _snapshot_unique_key_exists is None:
+        try:
+            _snapshot_unique_key_exists = _has_snapshot_unique_key(session.get_bind())
+        except Exception as e:
+            logger.error(f"Could not inspect {IndexSnapshot.__tablename__} indexes: {e}")
+            _snapshot_unique_key_exists = False
+        if not _snapshot_unique_key_exists:
+            logger.warning(f"⚠️ {SNAPSHOT_UNIQUE_KEY_NAME} missing; writing snapshots with delete-and-insert. "
+                           f"Run 'python get_index_performance.py migrate' to enable upserts.")
+    return _snapshot_unique_key_exists
+
+def migrate_snapshot_unique_key(logger) -> int:
+    """
+    One-off migration: remove duplicate (index_id, snapshot_date) rows, keeping the newest of each,
+    then add the unique key. Returns the number of duplicate rows deleted.
+    """
+    table = IndexSnapshot.__tablename__
+    pk = list(IndexSnapshot.__table__.primary_key.columns)[0].name
+    session = next(get_db_session())
+    try:
+        if _has_snapshot_unique_key(session.get_bind()):
+            logger.info(f"✅ {SNAPSHOT_UNIQUE_KEY_NAME} already exists")
+            return 0
+        deleted = session.execute(text(
+            f"DELETE older FROM {table} AS older JOIN {table} AS newer "
+            f"ON older.index_id = newer.index_id AND older.snapshot_date = newer.snapshot_date "
+            f"AND older.{pk} < newer.{pk}"
+        )).rowcount
+        session.commit()
+        logger.info(f"🧹 Removed {deleted} duplicate snapshot rows")
+        session.execute(text(
+            f"CREATE UNIQUE INDEX {SNAPSHOT_UNIQUE_KEY_NAME} ON {table} ({', '.join(SNAPSHOT_KEY_COLUMNS)})"
+        ))
+        logger.info(f"✅ Created {SNAPSHOT_UNIQUE_KEY_NAME}")
+        return deleted
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
 
 def run_delete_snapshots_for_today(logger) -> int:
     """
@@ -253,5 +487,11 @@ def main():
 
 if __name__ == "__main__":
     logger = logging.getLogger("FallbackLogger")  # Initialize fallback logger
-    load_index_performance_to_db(logger)
+    if len(sys.argv) > 1 and sys.argv[1] == "migrate":
+        migrate_snapshot_unique_key(logger)
+    elif len(sys.argv) > 2 and sys.argv[1] == "bench":
+        # e.g. python get_index_performance.py bench http://127.0.0.1:8765/stock-market-today
+        benchmark_advance_decline(sys.argv[2], logger)
+    else:
+        load_index_performance_to_db(logger)
 
@@ -3,7 +3,8 @@ import logging
 import json
 import os
 from dotenv import load_dotenv
-from fyers_apiv3 import fyersModel
+from fyers_quotes import fetch_quotes, get_fyers_client
+from quote_cache import get_quote_cache
 
 from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.market_context.index_snapshot import IndexSnapshotRepository
 from algo_scripts.algotrade.scripts.trade_utils.time_manager import get_today_date_as_str
@@ -15,31 +16,29 @@ from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.s
 load_dotenv()
 
 def get_quotes(fyers_token, symbols, logger):
-    """Fetches quotes for a list of symbols."""
-    symbols_string = ",".join([f"NSE:{s.upper()}-EQ" for s in symbols])
-    data = {"symbols": symbols_string}
-    logger.info(f"Fetching quotes for: {symbols_string}")
-
+    """Fetches quotes for a list of symbols, in concurrent chunks under the broker's symbol limit."""
     try:
-        response = fyers_token.quotes(data)
-        logger.info(f"Quotes response: {response}")
-
-        if response.get("s") == "ok":
-            return response
-        else:
-            logger.error(f"Fyers API error: {response.get('message', 'Unknown error')}")
-            return None
+        response = fetch_quotes(fyers_token, symbols, logger)
+        if response is None:
+            logger.error("Fyers API error: no quote chunk succeeded")
+        return response
     except Exception as e:
         logger.exception("Exception occurred while fetching quotes.")
         return None
 
 def get_intra_stock_data(fyers_token, stock_symbols, logger):
-    """Fetches intraday stock data (LTP, etc.) for a list of symbols."""
-    response_data = get_quotes(fyers_token, stock_symbols, logger)
+    """Fetches intraday stock data (LTP, etc.) for a list of symbols, reading through the shared quote cache."""
+    try:
+        response_data = get_quote_cache().get_quotes(fyers_token, stock_symbols, logger)
+    except Exception as e:
+        logger.exception("Exception occurred while fetching quotes.")
+        response_data = None
 
     if not response_data or "d" not in response_data:
         logger.error("Failed to fetch LTP from all tokens.")
         return []
+    if response_data.get("failed"):
+        logger.warning(f"⚠️ No quotes for {len(response_data['failed'])} symbols: {response_data['failed']}")
 
     stock_data = []
     for stock in response_data["d"]:
@@ -59,14 +58,7 @@ def get_ohl_stocks_intra_screener(logger):
     This function fetches Open-High-Low (OHL) data, processes it based on market trend (bullish/bearish),
     and returns potential buy and sell signals.
     """
-    fyers_token_primary = os.getenv('FYERS_ACCESS_TOKEN')
-    fyers_client_id = os.getenv('FYERS_CLIENT_ID')
-    fyers_token = fyersModel.FyersModel(
-        token=fyers_token_primary,
-        is_async=False,
-        client_id=fyers_client_id,
-        log_path="."
-    )
+    fyers_token = get_fyers_client()
 
     db_session = get_db_session()
     intra_alerts_repo = SgIntradayScreenerSignalsRepository()
@@ -84,39 +76,35 @@ def get_ohl_stocks_intra_screener(logger):
         logger.error("Could not retrieve index data. Skipping OHL processing.")
         return buy_signals, sell_signals
 
-    def get_intra_get_level(stock_name: str):
-        """Fetches the intraday level for a given stock."""
-        level_data = intra_alerts_repo.fetch_signals_by_date_stock_and_screeners(today_str, stock_name[4:-3])
-        return level_data[0].level if level_data else -1
-
-    if "BULLISH" in str(index_data[0].breadth_trend):
+    bullish = "BULLISH" in str(index_data[0].breadth_trend)
+    if bullish:
         logger.info("Market trend is BULLISH. Looking for buy signals.")
-        ohl_data = ohl_repo.get_by_screener_date_and_screener(today_str)
-        ohl_data_filtered = [x[4] for x in ohl_data if "Low" in x[3] and "PRB" in x[-1]]
-        ohl_data_dict = tv_repo.check_stocks_by_date_and_screener(ohl_data_filtered, today_str)
+    else:
+        logger.info("Market trend is BEARISH. Looking for sell signals.")
 
-        stock_symbols = [i[0][0] for i in ohl_data_dict]
-        ltp_data = get_intra_stock_data(fyers_token, stock_symbols, logger)
+    ohl_data = ohl_repo.get_by_screener_date_and_screener(today_str)
+    ohl_kind = "Low" if bullish else "High"
+    ohl_data_filtered = [x[4] for x in ohl_data if ohl_kind in x[3] and "PRB" in x[-1]]
+    signalled = tv_repo.get_signalled_tickers_by_date(ohl_data_filtered, today_str)
 
-        for stock in ltp_data:
-            level = get_intra_get_level(stock["symbol"])
-            if level != -1 and stock["ltp"] > level:
-                buy_signals.append({"symbol": stock["symbol"], "to_buy": True, "to_sell": False, "ltp": stock["ltp"], "level": level})
-        logger.info(f"Found {len(buy_signals)} potential buy signals.")
+    stock_symbols = [s for s in dict.fromkeys(ohl_data_filtered) if s in signalled]
+    ltp_data = get_intra_stock_data(fyers_token, stock_symbols, logger)
 
-    else:
-        logger.info("Market trend is BEARISH. Looking for sell signals.")
-        ohl_data = ohl_repo.get_by_screener_date_and_screener(today_str)
-        ohl_data_filtered = [x[4] for x in ohl_data if "High" in x[3] and "PRB" in x[-1]]
-        ohl_data_dict = tv_repo.check_stocks_by_date_and_screener(ohl_data_filtered, today_str)
+    # One query for the intraday levels of every quoted stock ("NSE:SBIN-EQ" -> "SBIN")
+    levels = intra_alerts_repo.fetch_levels_for_stocks(today_str, [stock["symbol"][4:-3] for stock in ltp_data])
 
-        stock_symbols = [i[0][0] for i in ohl_data_dict]
-        ltp_data = get_intra_stock_data(fyers_token, stock_symbols, logger)
+    for stock in ltp_data:
+        level = levels.get(stock["symbol"][4:-3].strip().upper(), -1)
+        if level == -1:
+            continue
+        if bullish and stock["ltp"] > level:
+            buy_signals.append({"symbol": stock["symbol"], "to_buy": True, "to_sell": False, "ltp": stock["ltp"], "level": level})
+        elif not bullish and stock["ltp"] < level:
+            sell_signals.append({"symbol": stock["symbol"], "to_buy": False, "to_sell": True, "ltp": stock["ltp"], "level": level})
 
-        for stock in ltp_data:
-            level = get_intra_get_level(stock["symbol"])
-            if level != -1 and stock["ltp"] < level:
-                sell_signals.append({"symbol": stock["symbol"], "to_buy": False, "to_sell": True, "ltp": stock["ltp"], "level": level})
+    if bullish:
+        logger.info(f"Found {len(buy_signals)} potential buy signals.")
+    else:
         logger.info(f"Found {len(sell_signals)} potential sell signals.")
 
     return buy_signals, sell_signals
@@ -161,10 +149,10 @@ if __name__ == "__main__":
                 ]
             }
 
-    class MockFyersModelModule:
-        FyersModel = MockFyersModelClass
+    def mock_get_fyers_client():
+        return MockFyersModelClass(token="dummy_token", is_async=False, client_id="dummy_client", log_path=".")
 
-    fyersModel = MockFyersModelModule
+    get_fyers_client = mock_get_fyers_client
 
 
     # Mocking database and utility functions that are not available
@@ -190,22 +178,15 @@ if __name__ == "__main__":
     class MockTVSignalsRepository:
         def __init__(self, session=None):
             pass
-        def check_stocks_by_date_and_screener(self, symbols, date_str):
+        def get_signalled_tickers_by_date(self, symbols, date_str):
             # Return the symbols that pass the check
-            return [( (s,), ) for s in symbols]
-
-    class MockIntraAlert:
-        def __init__(self, level):
-            self.level = level
+            return set(symbols)
 
     class MockSgIntradayScreenerSignalsRepository:
-        def fetch_signals_by_date_stock_and_screeners(self, date_str, stock_name):
+        def fetch_levels_for_stocks(self, date_str, stock_names):
             # Dummy levels for stocks
-            if "SBIN" in stock_name:
-                return [MockIntraAlert(645.00)]
-            if "RELIANCE" in stock_name:
-                return [MockIntraAlert(2910.00)]
-            return []
+            levels = {"SBIN": 645.00, "RELIANCE": 2910.00}
+            return {name: levels[name] for name in stock_names if name in levels}
 
     def mock_get_today_date_as_str():
         return "2024-01-01"
@@ -224,7 +205,7 @@ if __name__ == "__main__":
     # --- Invoking Functions with Dummy Data ---
 
     logger.info("--- Demonstrating get_quotes function ---")
-    mock_fyers_token = fyersModel.FyersModel(token="dummy_token", is_async=False, client_id="dummy_client", log_path=".")
+    mock_fyers_token = get_fyers_client()
     dummy_symbols = ["SBIN", "RELIANCE"]
     quotes = get_quotes(mock_fyers_token, dummy_symbols, logger)
     logger.info(f"get_quotes returned: {json.dumps(quotes, indent=2)}")
@@ -0,0 +1,95 @@
+import os
+import time
+import threading
+import logging
+
+from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.market_context.index_master import \
+    IndexMaster, IndexMasterRepository
+
+logger = logging.getLogger(__name__)
+
+# IndexMaster rows change only when an index is added or renamed, so a long TTL is fine
+INDEX_SYMBOL_CACHE_TTL = int(os.getenv("INDEX_SYMBOL_CACHE_TTL", str(6 * 60 * 60)))
+
+
+class IndexSymbolCache:
+    """
+    Process-wide symbol -> index_id map in front of IndexMasterRepository.
+    The whole table is loaded in one query and reloaded after `ttl` seconds or invalidate().
+    Symbols missing from the bulk load are looked up once through the repository and the
+    answer, including "not found", is kept until the next reload.
+    """
+
+    def __init__(self, ttl: int = INDEX_SYMBOL_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._ids = {}
+        self._loaded_at = None
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    def _expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def _load(self, session):
+        rows = session.query(IndexMaster.symbol, IndexMaster.index_id).all()
+        self._ids = {symbol: index_id for symbol, index_id in rows}
+        self._loaded_at = time.monotonic()
+        self.loads += 1
+        logger.info(f"📚 Loaded {len(self._ids)} index symbols into cache")
+
+    def get_index_id(self, session, symbol: str):
+        """Return the index_id for `symbol`, or None if IndexMaster has no such index."""
+        with self._lock:
+            if self._expired():
+                self._load(session)
+            if symbol in self._ids:
+                self.hits += 1
+                return self._ids[symbol]
+            self.misses += 1
+
+        master = IndexMasterRepository(session).get_index_by_symbol(symbol)
+        index_id = master.index_id if master else None
+        with self._lock:
+            self._ids[symbol] = index_id
+        return index_id
+
+    def resolve(self, session, symbols) -> dict:
+        """Map each symbol to its index_id; unknown symbols are left out."""
+        resolved = {}
+        for symbol in symbols:
+            index_id = self.get_index_id(session, symbol)
+            if index_id is not None:
+                resolved[symbol] = index_id
+        return resolved
+
+    def invalidate(self):
+        with self._lock:
+            self._ids = {}
+            self._loaded_at = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": sum(1 for index_id in self._ids.values() if index_id is not None),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else None,
+                "loads": self.loads,
+                "age_seconds": None if self._loaded_at is None else round(time.monotonic() - self._loaded_at, 1),
+                "ttl_seconds": self.ttl,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_index_symbol_cache() -> IndexSymbolCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = IndexSymbolCache()
+        return _cache
@@ -0,0 +1,139 @@
+"""
+Local stand-in for intradayscreener.com that replays recorded responses.
+
+    python intraday_screener_fixture_server.py record   # save live responses for the configured API paths
+    python intraday_screener_fixture_server.py serve    # replay them on FIXTURE_SERVER_PORT
+    python intraday_screener_fixture_server.py bench    # time the HTTP fetch engine against the replay
+
+Recorded responses live under INTRADAY_SCREENER_FIXTURE_DIR, one file per request path.
+"""
+import os
+import sys
+import time
+import logging
+import mimetypes
+import statistics
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+import intraday_screener_http as screener_http
+
+FIXTURE_DIR = os.getenv(
+    "INTRADAY_SCREENER_FIXTURE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "intradayscreener"),
+)
+FIXTURE_SERVER_PORT = int(os.getenv("FIXTURE_SERVER_PORT", "8765"))
+FIXTURE_EXTENSIONS = (".json", ".csv", ".html")
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s: %(message)s")
+logger = logging.getLogger("fixture-server")
+
+
+def fixture_path(request_path: str, fixture_dir: str = FIXTURE_DIR):
+    """Map a request path (query string ignored) to the recorded file that answers it, or None."""
+    relative = urlsplit(request_path).path.strip("/") or "index"
+    base = os.path.normpath(os.path.join(fixture_dir, relative))
+    if not base.startswith(os.path.normpath(fixture_dir)):
+        return None
+    if os.path.isfile(base):
+        return base
+    for ext in FIXTURE_EXTENSIONS:
+        if os.path.isfile(base + ext):
+            return base + ext
+    return None
+
+
+def make_handler(fixture_dir: str):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+
+        def do_GET(self):
+            path = fixture_path(self.path, fixture_dir)
+            if not path:
+                self.send_error(404, "No recorded response")
+                return
+            with open(path, "rb") as f:
+                body = f.read()
+            content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            self.send_response(200)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return FixtureHandler
+
+
+def start_fixture_server(port: int = 0, fixture_dir: str = FIXTURE_DIR):
+    """Start the replay server on a background thread and return (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(fixture_dir))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def record_fixtures(fixture_dir: str = FIXTURE_DIR):
+    """Fetch every configured API path from the live site and store the response bodies."""
+    for feed, path in screener_http.ENDPOINT_PATHS.items():
+        if not path:
+            logger.info(f"Skipping {feed}: no API path configured")
+            continue
+        with screener_http._get(feed, logger, needs_auth=feed in ("accuracy", "alerts", "momentum")) as response:
+            ext = ".csv" if "csv" in response.headers.get("Content-Type", "") else ".json"
+            body = response.content
+        target = os.path.join(fixture_dir, urlsplit(path).path.strip("/"))
+        if not os.path.splitext(target)[1]:
+            target += ext
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(body)
+        logger.info(f"Recorded {feed} -> {target}")
+
+
+def run_benchmark(rounds: int = 20, fixture_dir: str = FIXTURE_DIR):
+    """Time each HTTP feed against the replay server and log median/max latency."""
+    server, base_url = start_fixture_server(fixture_dir=fixture_dir)
+    bench_logger = logging.getLogger("fixture-bench")
+    bench_logger.setLevel(logging.WARNING)
+    feeds = {
+        "index_performance": lambda: screener_http.fetch_index_performance(bench_logger, base_url),
+    }
+    for scan in ("accuracy", "alerts", "momentum"):
+        feeds[scan] = lambda scan=scan: list(screener_http.fetch_scan_rows(scan, bench_logger, base_url, needs_auth=False))
+
+    try:
+        for name, fetch in feeds.items():
+            timings = []
+            try:
+                for _ in range(rounds):
+                    started = time.perf_counter()
+                    rows = fetch()
+                    timings.append(time.perf_counter() - started)
+            except screener_http.HttpFetchUnavailable as e:
+                logger.info(f"{name}: skipped ({e})")
+                continue
+            logger.info(
+                f"{name}: {len(rows)} rows, median {statistics.median(timings) * 1000:.1f} ms, "
+                f"max {max(timings) * 1000:.1f} ms over {rounds} rounds"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "serve"
+    if command == "record":
+        record_fixtures()
+    elif command == "bench":
+        run_benchmark()
+    else:
+        server, base_url = start_fixture_server(FIXTURE_SERVER_PORT)
+        logger.info(f"Replaying {FIXTURE_DIR} on {base_url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.shutdown()
@@ -0,0 +1,207 @@
+import os
+import csv
+import time
+import threading
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+
+from intraday_screener_session import load_cached_session
+
+# ---------------- Load Env ---------------- #
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# "browser" drives Chrome as before, "http" calls the endpoints behind the SPA directly
+INTRADAY_SCREENER_FETCH_MODE = os.getenv("INTRADAY_SCREENER_FETCH_MODE", "browser").lower()
+INTRADAY_SCREENER_API_BASE = os.getenv("INTRADAY_SCREENER_API_BASE", "https://intradayscreener.com")
+HTTP_TIMEOUT_SECONDS = float(os.getenv("INTRADAY_SCREENER_HTTP_TIMEOUT", "10"))
+HTTP_POOL_SIZE = int(os.getenv("INTRADAY_SCREENER_HTTP_POOL_SIZE", "10"))
+# localStorage key holding the bearer token saved with the browser session, if the API wants one
+AUTH_STORAGE_KEY = os.getenv("INTRADAY_SCREENER_AUTH_STORAGE_KEY")
+
+# API paths behind the SPA, matching the recorded fixtures; override one if the site moves it,
+# or set it empty to keep that feed on the browser scrape
+ENDPOINT_PATHS = {
+    "index_panel": os.getenv("INTRADAY_SCREENER_API_INDEX_PANEL", "api/market/index-panel"),
+    "advance_decline": os.getenv("INTRADAY_SCREENER_API_ADVANCE_DECLINE", "api/market/advance-decline"),
+    "accuracy": os.getenv("INTRADAY_SCREENER_API_ACCURACY", "api/scan/1111"),
+    "alerts": os.getenv("INTRADAY_SCREENER_API_ALERTS", "api/intraday-stock-alerts"),
+    "momentum": os.getenv("INTRADAY_SCREENER_API_MOMENTUM", "api/intraday-momentum"),
+}
+
+
+def _json_fields(feed: str, default: str):
+    """Comma-separated JSON field names in CSV column order; an empty slot is a column parse_rows never reads."""
+    fields = os.getenv(f"INTRADAY_SCREENER_JSON_FIELDS_{feed.upper()}", default)
+    return [field.strip() or None for field in fields.split(",")]
+
+
+# JSON scan records mapped onto the positions parse_rows reads from the site's CSV export
+SCAN_JSON_FIELDS = {
+    "accuracy": _json_fields("accuracy", "symbol,ltp,volume,deviationFromPivots,sector"),
+    "alerts": _json_fields("alerts", "symbol,,,,todaysRange,ltp"),
+    "momentum": _json_fields(
+        "momentum",
+        "symbol,ltp,,volChange,volRatio,momentumRank,ema21Percentage,vwapPercentage,"
+        "fiftyTwoWeekHigh,fiftyTwoWeekLow,rsi5Min,adx5Min",
+    ),
+}
+
+
+class HttpFetchUnavailable(Exception):
+    """Raised when a feed cannot be fetched over HTTP and the caller should fall back to the browser."""
+
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Return the process-wide keep-alive HTTP session, creating it on first use."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"Accept": "application/json, text/csv, */*"})
+            _http_session = session
+        return _http_session
+
+
+def use_http_fetch() -> bool:
+    return INTRADAY_SCREENER_FETCH_MODE == "http"
+
+
+def _cached_auth(needs_auth: bool):
+    """
+    Return (cookies, headers) from the cached browser session, to be sent with a single request.
+    The shared HTTP session is never modified, so concurrent fetches cannot see each other's auth.
+    """
+    cached = load_cached_session()
+    if not cached:
+        if needs_auth:
+            raise HttpFetchUnavailable("no cached intradayscreener session; a browser login is needed first")
+        return None, None
+    cookies = requests.cookies.RequestsCookieJar()
+    for cookie in cached.get("cookies", []):
+        cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+    token = (cached.get("local_storage") or {}).get(AUTH_STORAGE_KEY) if AUTH_STORAGE_KEY else None
+    headers = {"Authorization": f"Bearer {token.strip(chr(34))}"} if token else None
+    return cookies, headers
+
+
+def _get(feed: str, logger, base_url: str = None, needs_auth: bool = False, stream: bool = False):
+    path = ENDPOINT_PATHS.get(feed)
+    if not path:
+        raise HttpFetchUnavailable(f"no API path configured for {feed}")
+    session = get_http_session()
+    cookies, headers = _cached_auth(needs_auth)
+
+    url = f"{(base_url or INTRADAY_SCREENER_API_BASE).rstrip('/')}/{path.lstrip('/')}"
+    started = time.perf_counter()
+    response = session.get(url, cookies=cookies, headers=headers, timeout=HTTP_TIMEOUT_SECONDS, stream=stream)
+    if response.status_code in (401, 403):
+        response.close()
+        raise HttpFetchUnavailable(f"{feed} rejected the cached session ({response.status_code})")
+    try:
+        response.raise_for_status()
+    except Exception:
+        response.close()
+        raise
+    logger.info(f"🌐 Fetched {feed} over HTTP in {time.perf_counter() - started:.3f}s")
+    return response
+
+
+def _pick(obj: dict, *keys, default=None):
+    for key in keys:
+        if key in obj and obj[key] is not None:
+            return obj[key]
+    return default
+
+
+def _records(payload):
+    """Unwrap the list of records from either a bare list or a {"data": [...]} envelope."""
+    if isinstance(payload, dict):
+        payload = _pick(payload, "data", "result", "rows", default=[])
+    return payload or []
+
+
+def fetch_index_performance(logger, base_url: str = None):
+    """
+    Fetch the index panel and advance/decline breadth over HTTP.
+    Returns rows of [name, value, percent, advances, declines], the shape write_to_db expects.
+    Raises HttpFetchUnavailable when any index is missing a value, so no placeholder is stored.
+    """
+    with _get("index_panel", logger, base_url) as response:
+        panel = _records(response.json())
+    with _get("advance_decline", logger, base_url) as response:
+        breadth = _records(response.json())
+
+    results = {}
+    for item in panel:
+        name = _pick(item, "name", "indexName", "symbol")
+        if not name:
+            continue
+        value = _pick(item, "value", "ltp", "lastPrice")
+        percent = _pick(item, "percent", "pChange", "percentChange")
+        if value is None or percent is None:
+            raise HttpFetchUnavailable(f"index panel has no value/percent for {name}")
+        results[name] = (value, str(percent).strip("()%"))
+
+    adv_decl_map = {}
+    for item in breadth:
+        name = _pick(item, "name", "indexName", "index")
+        if not name:
+            continue
+        advances = _pick(item, "advances", "advance")
+        declines = _pick(item, "declines", "decline")
+        if advances is None or declines is None:
+            raise HttpFetchUnavailable(f"advance/decline feed has no counts for {name}")
+        adv_decl_map[name] = (int(advances), int(declines))
+
+    unmatched = set(results) ^ set(adv_decl_map)
+    if unmatched:
+        raise HttpFetchUnavailable(f"index panel and advance/decline feeds disagree on {sorted(unmatched)}")
+    return [[name, *results[name], *adv_decl_map[name]] for name in results]
+
+
+def fetch_scan_rows(feed: str, logger, base_url: str = None, needs_auth: bool = True):
+    """
+    Request a scan (accuracy, alerts or momentum) and return an iterator over its rows, header
+    first, in the same column order as the site's CSV export. CSV responses are streamed through;
+    JSON records are laid out by SCAN_JSON_FIELDS, and a payload missing one of those fields
+    raises HttpFetchUnavailable rather than shifting values into the wrong columns.
+    """
+    response = _get(feed, logger, base_url, needs_auth=needs_auth, stream=True)
+    if "csv" in response.headers.get("Content-Type", ""):
+        return _iter_csv_rows(response)
+
+    with response:
+        records = _records(response.json())
+    fields = SCAN_JSON_FIELDS[feed]
+    if records:
+        missing = [field for field in fields if field and field not in records[0]]
+        if missing:
+            raise HttpFetchUnavailable(
+                f"{feed} JSON has no {missing}; set INTRADAY_SCREENER_JSON_FIELDS_{feed.upper()}")
+    return _iter_json_rows(records, fields)
+
+
+def _iter_csv_rows(response):
+    with response:
+        response.encoding = response.encoding or "utf-8"
+        yield from csv.reader(response.iter_lines(decode_unicode=True))
+
+
+def _iter_json_rows(records, fields):
+    if not records:
+        return
+    yield [field or "" for field in fields]
+    for record in records:
+        yield ["" if not field or record.get(field) is None else str(record[field]) for field in fields]
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import threading
+import weakref
+import logging
+from dotenv import load_dotenv
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from webdriver_pool import on_driver_discarded
+
+# ---------------- Load Env ---------------- #
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+INTRADAY_SCREENER_URL = "https://intradayscreener.com"
+INTRADAY_SCREENER_LOGIN_URL = f"{INTRADAY_SCREENER_URL}/login"
+INTRADAY_SCREENER_EMAIL = os.getenv("INTRADAY_SCREENER_EMAIL")
+INTRADAY_SCREENER_PWD = os.getenv("INTRADAY_SCREENER_PWD")
+# Kept in a per-user directory rather than the shared temp dir, since it holds auth cookies
+SESSION_CACHE_FILE = os.getenv(
+    "INTRADAY_SCREENER_SESSION_FILE",
+    os.path.join(os.path.expanduser("~"), ".cache", "intradayscreener", "session.json"),
+)
+# Cached sessions older than this are treated as expired even if the cookies claim otherwise
+SESSION_TTL_SECONDS = int(os.getenv("INTRADAY_SCREENER_SESSION_TTL", str(6 * 60 * 60)))
+# Names of the cookies that carry the login; when unset, any cookie meant to outlive SESSION_COOKIE_MIN_LIFETIME counts
+AUTH_COOKIE_NAMES = {n.strip() for n in os.getenv("INTRADAY_SCREENER_AUTH_COOKIES", "").split(",") if n.strip()}
+# Cookies set to live shorter than this (analytics and the like) do not expire the cached session
+SESSION_COOKIE_MIN_LIFETIME = int(os.getenv("INTRADAY_SCREENER_SESSION_COOKIE_MIN_LIFETIME", str(60 * 60)))
+
+_login_lock = threading.Lock()
+# driver -> saved_at of the cached session already applied to it; entries go when the pool discards the driver
+_applied_sessions = weakref.WeakKeyDictionary()
+
+
+def forget_driver(driver):
+    _applied_sessions.pop(driver, None)
+
+
+on_driver_discarded(forget_driver)
+
+
+def _is_auth_cookie(cookie, saved_at) -> bool:
+    if AUTH_COOKIE_NAMES:
+        return cookie["name"] in AUTH_COOKIE_NAMES
+    return cookie["expiry"] - saved_at >= SESSION_COOKIE_MIN_LIFETIME
+
+
+def load_cached_session():
+    """Return the cached login session, or None if there is none or it has expired."""
+    try:
+        with open(SESSION_CACHE_FILE, mode="r", encoding="utf-8") as f:
+            session = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    now = time.time()
+    saved_at = session.get("saved_at", 0)
+    if now - saved_at > SESSION_TTL_SECONDS:
+        return None
+    expiries = [c["expiry"] for c in session.get("cookies", []) if c.get("expiry") and _is_auth_cookie(c, saved_at)]
+    if expiries and min(expiries) <= now:
+        return None
+    return session
+
+
+def save_session(driver):
+    """Persist the driver's cookies and localStorage so other runs and scrapers can reuse them."""
+    session = {
+        "saved_at": time.time(),
+        "cookies": driver.get_cookies(),
+        "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);") or {},
+    }
+    os.makedirs(os.path.dirname(SESSION_CACHE_FILE) or ".", mode=0o700, exist_ok=True)
+    tmp_file = f"{SESSION_CACHE_FILE}.{os.getpid()}.tmp"
+    # The file holds auth cookies and tokens: readable by the owner only, whatever the umask
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, mode="w", encoding="utf-8") as f:
+        json.dump(session, f)
+    os.replace(tmp_file, SESSION_CACHE_FILE)
+    _applied_sessions[driver] = session["saved_at"]
+    return session
+
+
+def invalidate_session():
+    try:
+        os.remove(SESSION_CACHE_FILE)
+    except FileNotFoundError:
+        pass
+
+
+def restore_session(driver, session):
+    """Load a cached session into the driver. The driver must be on the site's origin to set cookies."""
+    if not driver.current_url.startswith(INTRADAY_SCREENER_URL):
+        driver.get(INTRADAY_SCREENER_URL)
+    driver.delete_all_cookies()
+    now = time.time()
+    for cookie in session.get("cookies", []):
+        if cookie.get("expiry") and cookie["expiry"] <= now:
+            continue  # short-lived cookies the site will set again
+        cookie.pop("sameSite", None)
+        driver.add_cookie(cookie)
+    local_storage = session.get("local_storage") or {}
+    if local_storage:
+        driver.execute_script(
+            "for (const [k, v] of Object.entries(arguments[0])) { window.localStorage.setItem(k, v); }",
+            local_storage,
+        )
+    _applied_sessions[driver] = session["saved_at"]
+
+
+def login(driver, logger):
+    """Log in through the form and cache the resulting session."""
+    driver.get(INTRADAY_SCREENER_LOGIN_URL)
+    logger.info("🌐 Opened login page.")
+    email_input = WebDriverWait(driver, 20).until(
+        EC.visibility_of_element_located((By.XPATH, '//input[@type="email"]'))
+    )
+    email_input.clear()
+    email_input.send_keys(INTRADAY_SCREENER_EMAIL)
+
+    password_input = driver.find_element(By.XPATH, '//input[@type="password"]')
+    password_input.clear()
+    password_input.send_keys(INTRADAY_SCREENER_PWD)
+
+    signin_btn = driver.find_element(By.XPATH, '//form//button')
+    driver.execute_script("arguments[0].scrollIntoView(true);", signin_btn)
+    driver.execute_script("arguments[0].click();", signin_btn)
+    logger.info("🔐 Login submitted.")
+
+    # Wait for the SPA to leave the login route instead of sleeping a fixed time
+    WebDriverWait(driver, 20).until(lambda d: not _on_login_page(d))
+    save_session(driver)
+    logger.info("🔐 Login successful, session cached.")
+
+
+def _on_login_page(driver) -> bool:
+    return "/login" in driver.current_url
+
+
+def _ensure_session(driver, logger, rejected_saved_at=None):
+    cached = load_cached_session()
+    if cached and cached["saved_at"] != rejected_saved_at:
+        if _applied_sessions.get(driver) != cached["saved_at"]:
+            restore_session(driver, cached)
+            logger.info("🍪 Reusing cached intradayscreener session.")
+        return cached["saved_at"]
+
+    # Only one scraper logs in at a time; the others pick up its cached session
+    with _login_lock:
+        cached = load_cached_session()
+        if cached and cached["saved_at"] != rejected_saved_at:
+            restore_session(driver, cached)
+            logger.info("🍪 Reusing session cached by another scraper.")
+            return cached["saved_at"]
+        invalidate_session()
+        login(driver, logger)
+        return _applied_sessions[driver]
+
+
+def open_authenticated_page(driver, url: str, logger):
+    """
+    Navigate to `url` with a logged-in session.
+    Logs in only when there is no usable cached session or the site bounces the cached one to /login.
+    """
+    saved_at = _ensure_session(driver, logger)
+    driver.get(url)
+    if _on_login_page(driver):
+        logger.info("🔐 Cached session expired, logging in again.")
+        forget_driver(driver)
+        _ensure_session(driver, logger, rejected_saved_at=saved_at)
+        driver.get(url)
@@ -0,0 +1,233 @@
+import threading
+from typing import Iterable, List, Optional
+from sqlalchemy import Column, String, Integer, Date, Index, PrimaryKeyConstraint, event, func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.management.database_manager import Base
+
+BULLISH = "bullish"
+BEARISH = "bearish"
+POLARITY_COLUMNS = {BULLISH: "bullish_milestone_tags", BEARISH: "bearish_milestone_tags"}
+# session.info key for tag ids read in the current transaction, merged into the shared map on commit
+_PENDING_TAG_IDS = "pending_milestone_tag_ids"
+
+
+# ✅ Tag dictionary: every milestone tag name is stored once and referenced by id
+class MilestoneTag(Base):
+    __tablename__ = "sg_milestone_tags"
+
+    tag_id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False)
+    __table_args__ = (
+        Index('unique_milestone_tag_name', 'name', unique=True),
+    )
+
+
+def _link_table_args(prefix: str):
+    return (
+        PrimaryKeyConstraint('signal_id', 'polarity', 'tag_id'),
+        # ✅ find_signals_by_tags: date + polarity + tag, covering signal_id
+        Index(f'ix_{prefix}_date_tag_signal', 'screener_date', 'polarity', 'tag_id', 'signal_id'),
+    )
+
+
+# ✅ (signal_id, tag_id) join tables, one per signal table
+class SgIntradaySignalMilestoneTags(Base):
+    __tablename__ = "sg_intraday_screener_signal_tags"
+
+    signal_id = Column(Integer, nullable=False)
+    polarity = Column(String(10), nullable=False)
+    tag_id = Column(Integer, nullable=False)
+    screener_date = Column(Date, nullable=False)
+    __table_args__ = _link_table_args("intraday_signal_tags")
+
+
+class SgOhlSignalMilestoneTags(Base):
+    __tablename__ = "sg_ohl_signal_tags"
+
+    signal_id = Column(Integer, nullable=False)
+    polarity = Column(String(10), nullable=False)
+    tag_id = Column(Integer, nullable=False)
+    screener_date = Column(Date, nullable=False)
+    __table_args__ = _link_table_args("ohl_signal_tags")
+
+
+def split_tags(tags: Optional[str]) -> set:
+    """Split a space-joined milestone tag string into a set of tag names."""
+    return set(tags.split()) if tags else set()
+
+
+class MilestoneTagDictionary:
+    """
+    Process-wide name -> tag_id map; unknown names are inserted once and then served from memory.
+    Ids read inside a transaction stay pending on the session and only join the shared map when it
+    commits, so a rollback cannot leave the map pointing at tags that were never stored.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = {}
+
+    def _pending(self, session) -> dict:
+        pending = session.info.get(_PENDING_TAG_IDS)
+        if pending is None:
+            pending = session.info[_PENDING_TAG_IDS] = {}
+            event.listen(session, "after_commit", self._merge_pending)
+            event.listen(session, "after_rollback", self._drop_pending)
+        return pending
+
+    def _merge_pending(self, session):
+        pending = session.info.get(_PENDING_TAG_IDS)
+        if pending:
+            with self._lock:
+                self._ids.update(pending)
+            pending.clear()
+
+    def _drop_pending(self, session):
+        pending = session.info.get(_PENDING_TAG_IDS)
+        if pending:
+            pending.clear()
+
+    def _known(self, session, names: set) -> dict:
+        pending = self._pending(session)
+        with self._lock:
+            known = {name: self._ids[name] for name in names if name in self._ids}
+        known.update((name, pending[name]) for name in names - known.keys() if name in pending)
+        return known
+
+    def _load(self, session, names: set) -> dict:
+        rows = session.query(MilestoneTag.name, MilestoneTag.tag_id).filter(MilestoneTag.name.in_(names))
+        loaded = {row.name: row.tag_id for row in rows}
+        self._pending(session).update(loaded)
+        return loaded
+
+    def intern(self, session, names: Iterable[str]) -> dict:
+        names = set(names)
+        known = self._known(session, names)
+        missing = names - known.keys()
+        if missing:
+            session.execute(mysql_insert(MilestoneTag).prefix_with("IGNORE"), [{"name": n} for n in missing])
+            known.update(self._load(session, missing))
+        return known
+
+    def lookup(self, session, names: Iterable[str]) -> dict:
+        """Resolve names without creating them; names never seen are left out."""
+        names = set(names)
+        known = self._known(session, names)
+        missing = names - known.keys()
+        if missing:
+            known.update(self._load(session, missing))
+        return known
+
+    def names(self, session, tag_ids: Iterable[int]) -> dict:
+        tag_ids = set(tag_ids)
+        pending = self._pending(session)
+        with self._lock:
+            known = {tag_id: name for name, tag_id in self._ids.items() if tag_id in tag_ids}
+        known.update((tag_id, name) for name, tag_id in pending.items() if tag_id in tag_ids)
+        if len(known) < len(tag_ids):
+            rows = session.query(MilestoneTag.name, MilestoneTag.tag_id).filter(MilestoneTag.tag_id.in_(tag_ids - known.keys()))
+            for row in rows:
+                known[row.tag_id] = row.name
+                pending[row.name] = row.tag_id
+        return known
+
+
+_tag_dictionary = MilestoneTagDictionary()
+
+
+def record_milestone_tags(session, link_model, rows: List[dict]):
+    """
+    Add milestone tags to signals; tags already linked to a signal are ignored, so repeated
+    sightings merge as a set insert. Each row needs signal_id, screener_date and the
+    bullish_milestone_tags / bearish_milestone_tags strings. The caller commits.
+    """
+    parsed = [
+        (row, polarity, split_tags(row.get(column)))
+        for row in rows
+        for polarity, column in POLARITY_COLUMNS.items()
+    ]
+    tag_ids = _tag_dictionary.intern(session, set().union(*(tags for _, _, tags in parsed)))
+    links = [
+        {"signal_id": row["signal_id"], "polarity": polarity, "tag_id": tag_ids[tag], "screener_date": row["screener_date"]}
+        for row, polarity, tags in parsed
+        for tag in tags
+    ]
+    if links:
+        session.execute(mysql_insert(link_model.__table__).prefix_with("IGNORE"), links)
+    return len(links)
+
+
+def find_signal_ids_by_tags(session, link_model, screener_date, all_of: Iterable[str] = (),
+                            any_of: Iterable[str] = (), polarity: Optional[str] = None) -> set:
+    """
+    Return ids of signals on `screener_date` that carry every tag in `all_of` and at least one
+    tag in `any_of` (either filter may be empty), optionally restricted to one polarity.
+    """
+    all_of, any_of = set(all_of), set(any_of)
+    tag_ids = _tag_dictionary.lookup(session, all_of | any_of)
+    if all_of - tag_ids.keys() or (any_of and not any_of & tag_ids.keys()):
+        return set()
+
+    def signals_with(ids, min_distinct=1):
+        query = session.query(link_model.signal_id).filter(
+            link_model.screener_date == screener_date,
+            link_model.tag_id.in_(ids),
+        )
+        if polarity:
+            query = query.filter(link_model.polarity == polarity)
+        query = query.group_by(link_model.signal_id).having(func.count(func.distinct(link_model.tag_id)) >= min_distinct)
+        return {row.signal_id for row in query}
+
+    result = None
+    if all_of:
+        result = signals_with([tag_ids[t] for t in all_of], len(all_of))
+    if any_of:
+        matches = signals_with([tag_ids[t] for t in any_of if t in tag_ids])
+        result = matches if result is None else result & matches
+    return result or set()
+
+
+def get_milestone_tags(session, link_model, signal_ids: Iterable[int]) -> dict:
+    """Return {signal_id: {"bullish_milestone_tags": "...", "bearish_milestone_tags": "..."}} from the join table."""
+    signal_ids = list(signal_ids)
+    links = session.query(link_model.signal_id, link_model.polarity, link_model.tag_id).filter(
+        link_model.signal_id.in_(signal_ids)
+    ).all()
+    names = _tag_dictionary.names(session, {link.tag_id for link in links})
+    tags = {signal_id: {column: set() for column in POLARITY_COLUMNS.values()} for signal_id in signal_ids}
+    for link in links:
+        tags[link.signal_id][POLARITY_COLUMNS[link.polarity]].add(names[link.tag_id])
+    return {
+        signal_id: {column: " ".join(sorted(values)) or None for column, values in columns.items()}
+        for signal_id, columns in tags.items()
+    }
+
+
+def delete_milestone_tags(session, link_model, signal_ids_query):
+    """Remove the tag links of the signals selected by `signal_ids_query` (a query of signal ids)."""
+    return (
+        session.query(link_model)
+        .filter(link_model.signal_id.in_(signal_ids_query.scalar_subquery()))
+        .delete(synchronize_session=False)
+    )
+
+
+def backfill_milestone_tags(session, signal_model, link_model, screener_date=None, batch_size: int = 1000):
+    """Migration: index the tag strings of existing signal rows, optionally for one date only."""
+    query = session.query(
+        signal_model.id, signal_model.screener_date,
+        signal_model.bullish_milestone_tags, signal_model.bearish_milestone_tags,
+    )
+    if screener_date:
+        query = query.filter(signal_model.screener_date == screener_date)
+    batch, linked = [], 0
+    for row in query.yield_per(batch_size):
+        batch.append(dict(row._mapping, signal_id=row.id))
+        if len(batch) >= batch_size:
+            linked += record_milestone_tags(session, link_model, batch)
+            batch = []
+    if batch:
+        linked += record_milestone_tags(session, link_model, batch)
+    session.commit()
+    return linked
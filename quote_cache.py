@@ -0,0 +1,104 @@
+import os
+import time
+import threading
+import logging
+
+from fyers_quotes import to_fyers_symbol
+from quote_coalescer import get_quote_coalescer
+
+logger = logging.getLogger(__name__)
+
+# How long a quote is served from memory before it is fetched again
+FYERS_QUOTE_CACHE_TTL = float(os.getenv("FYERS_QUOTE_CACHE_TTL", "3"))
+
+
+class QuoteCache:
+    """
+    Process-wide symbol -> quote cache in front of fetch_quotes.
+    Callers get cached quotes for symbols fetched within `ttl` seconds; only the stale or
+    missing ones are requested, through the coalescer so concurrent misses share one broker call.
+    """
+
+    def __init__(self, ttl: float = FYERS_QUOTE_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._quotes = {}  # "NSE:SBIN-EQ" -> (fetched_at, quote)
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self._served_age_total = 0.0
+
+    def get_quotes(self, client, symbols, logger):
+        """
+        Return a quotes() shaped response for `symbols`, or None if nothing could be served.
+        Symbols whose fetch failed are listed under "failed", as fetch_quotes does.
+        """
+        wanted = list(dict.fromkeys(to_fyers_symbol(s) for s in symbols))
+        now = time.monotonic()
+        served, stale = {}, []
+        with self._lock:
+            for symbol in wanted:
+                entry = self._quotes.get(symbol)
+                if entry and now - entry[0] <= self.ttl:
+                    served[symbol] = entry[1]
+                    self.hits += 1
+                    self._served_age_total += now - entry[0]
+                else:
+                    stale.append(symbol)
+                    self.misses += 1
+
+        failed = []
+        if stale:
+            response = get_quote_coalescer().fetch(client, stale, logger)
+            failed = stale if response is None else response.get("failed", [])
+            fetched_at = time.monotonic()
+            with self._lock:
+                self.fetches += 1
+                for quote in (response or {}).get("d", []):
+                    self._quotes[quote["n"]] = (fetched_at, quote)
+                    served[quote["n"]] = quote
+            if response is None and not served:
+                return None
+
+        logger.debug(f"Quote cache served {len(wanted) - len(stale)} of {len(wanted)} symbols from memory")
+        result = {"s": "ok", "d": [served[symbol] for symbol in wanted if symbol in served]}
+        if failed:
+            result["failed"] = failed
+        return result
+
+    def invalidate(self, symbols=None):
+        with self._lock:
+            if symbols is None:
+                self._quotes.clear()
+            else:
+                for symbol in symbols:
+                    self._quotes.pop(to_fyers_symbol(symbol), None)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - fetched_at for fetched_at, _ in self._quotes.values()]
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._quotes),
+                "fresh_entries": sum(1 for age in ages if age <= self.ttl),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else None,
+                "broker_fetches": self.fetches,
+                "avg_served_age_ms": round(self._served_age_total / self.hits * 1000, 1) if self.hits else None,
+                "oldest_entry_age_s": round(max(ages), 1) if ages else None,
+                "ttl_seconds": self.ttl,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_quote_cache() -> QuoteCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = QuoteCache()
+        return _cache
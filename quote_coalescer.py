@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from fyers_quotes import fetch_quotes, to_fyers_symbol, StubQuotesClient
+
+logger = logging.getLogger(__name__)
+
+# While a fetch is in flight, requests arriving within this window share the next broker call; 0 disables coalescing
+FYERS_QUOTE_COALESCE_WINDOW_MS = float(os.getenv("FYERS_QUOTE_COALESCE_WINDOW_MS", "20"))
+
+
+class _Batch:
+    def __init__(self, client):
+        self.client = client
+        self.symbols = {}  # ordered set of requested symbols
+        self.done = threading.Event()
+        self.quotes = None  # symbol -> quote once fetched, None if the fetch failed
+        self.failed = set()  # symbols of chunks that failed in an otherwise successful fetch
+        self.error = None  # exception raised by the shared fetch, if any
+
+
+class QuoteCoalescer:
+    """
+    Micro-batches concurrent quote lookups. The first request opens a batch; if no fetch for the
+    same client is in flight it goes out at once, otherwise it waits `window_ms` so requests
+    arriving meanwhile can join. The batch then makes one chunked fetch_quotes call for the union
+    of symbols and every caller gets back only its own slice. A lone caller never waits.
+    """
+
+    def __init__(self, window_ms: float = FYERS_QUOTE_COALESCE_WINDOW_MS):
+        self.window = window_ms / 1000
+        self._lock = threading.Lock()
+        self._open = {}  # id(client) -> batch still accepting symbols
+        self._in_flight = {}  # id(client) -> number of batches currently fetching
+        self.immediate_batches = 0
+        self.requests = 0
+        self.batches = 0
+        self.symbols_requested = 0
+        self.symbols_fetched = 0
+
+    def fetch(self, client, symbols, logger):
+        """Return a quotes() shaped response for `symbols`, or None if the shared fetch failed."""
+        wanted = list(dict.fromkeys(to_fyers_symbol(s) for s in symbols))
+        if self.window <= 0:
+            with self._lock:
+                self.requests += 1
+                self.batches += 1
+                self.symbols_requested += len(wanted)
+                self.symbols_fetched += len(wanted)
+            return fetch_quotes(client, wanted, logger)
+
+        with self._lock:
+            self.requests += 1
+            self.symbols_requested += len(wanted)
+            batch = self._open.get(id(client))
+            leader = batch is None
+            if leader:
+                batch = self._open[id(client)] = _Batch(client)
+            batch.symbols.update(dict.fromkeys(wanted))
+
+        if leader:
+            self._run(batch, logger)
+        else:
+            batch.done.wait()
+            if batch.error is not None:
+                logger.error(f"Shared quote fetch for {len(wanted)} symbols failed: {batch.error}")
+
+        if batch.quotes is None:
+            return None
+        response = {"s": "ok", "d": [batch.quotes[symbol] for symbol in wanted if symbol in batch.quotes]}
+        failed = [symbol for symbol in wanted if symbol in batch.failed]
+        if failed:
+            response["failed"] = failed
+        return response
+
+    def _run(self, batch, logger):
+        key = id(batch.client)
+        with self._lock:
+            busy = self._in_flight.get(key, 0) > 0
+        if busy:
+            time.sleep(self.window)
+        with self._lock:
+            del self._open[key]
+            symbols = list(batch.symbols)
+            self.batches += 1
+            self.immediate_batches += not busy
+            self.symbols_fetched += len(symbols)
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        try:
+            response = fetch_quotes(batch.client, symbols, logger)
+            if response is not None:
+                batch.quotes = {quote["n"]: quote for quote in response.get("d", [])}
+                batch.failed = set(response.get("failed", []))
+        except Exception as e:
+            batch.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight[key] -= 1
+                if not self._in_flight[key]:
+                    del self._in_flight[key]
+            batch.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "window_ms": self.window * 1000,
+                "requests": self.requests,
+                "broker_batches": self.batches,
+                "immediate_batches": self.immediate_batches,
+                "requests_per_batch": round(self.requests / self.batches, 2) if self.batches else None,
+                "symbols_requested": self.symbols_requested,
+                "symbols_fetched": self.symbols_fetched,
+            }
+
+
+_coalescer = None
+_coalescer_lock = threading.Lock()
+
+
+def get_quote_coalescer() -> QuoteCoalescer:
+    global _coalescer
+    with _coalescer_lock:
+        if _coalescer is None:
+            _coalescer = QuoteCoalescer()
+        return _coalescer
+
+
+def benchmark_coalescing(callers: int = 12, symbols_per_caller: int = 40, universe: int = 200):
+    """Simulate a burst of loaders asking for overlapping symbols at once, with and without coalescing."""
+    bench_logger = logging.getLogger("quote-coalescer-bench")
+    bench_logger.setLevel(logging.WARNING)
+    requests = [[f"STOCK{(i * 17 + j) % universe}" for j in range(symbols_per_caller)] for i in range(callers)]
+
+    for window_ms in (0, FYERS_QUOTE_COALESCE_WINDOW_MS):
+        client = StubQuotesClient(latency=0.05)
+        coalescer = QuoteCoalescer(window_ms)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=callers) as pool:
+            responses = list(pool.map(lambda symbols: coalescer.fetch(client, symbols, bench_logger), requests))
+        elapsed = time.perf_counter() - started
+        complete = all(len(r["d"]) == len(set(s)) for r, s in zip(responses, requests))
+        print(f"window {window_ms:g} ms: {client.calls} broker calls, {coalescer.stats()['symbols_fetched']} symbols "
+              f"fetched for {callers} callers in {elapsed * 1000:.0f} ms (all slices complete: {complete})")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_coalescing()
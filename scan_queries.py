@@ -0,0 +1,118 @@
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, date
+
+import pytz
+from dateutil import parser
+from sqlalchemy import Index, select
+
+from db_engine import get_engine
+
+IST = pytz.timezone("Asia/Kolkata")
+# Rows fetched per round trip when streaming scan rows
+SCAN_QUERY_BATCH_SIZE = int(os.getenv("SCAN_QUERY_BATCH_SIZE", "500"))
+# Number of closed-run results kept in memory across the accuracy, alerts and momentum tables
+CLOSED_RUN_CACHE_SIZE = int(os.getenv("SCAN_CLOSED_RUN_CACHE_SIZE", "256"))
+
+
+def scan_indexes(table_name: str):
+    """Secondary indexes for the run-id and date lookups, for a scan model's __table_args__."""
+    return (
+        Index(f"ix_{table_name}_run_id", "screener_run_id"),
+        Index(f"ix_{table_name}_date_screener_stock", "screener_date", "screener", "stock_name"),
+    )
+
+
+def create_scan_indexes(model):
+    """Migration: create a scan table's secondary indexes if they are missing."""
+    for index in model.__table__.indexes:
+        index.create(bind=get_engine(), checkfirst=True)
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return parser.parse(value).date()
+    return value
+
+
+def _today() -> date:
+    return datetime.now(IST).date()
+
+
+class ClosedRunCache:
+    """LRU of query results for screener dates before today, which are never written to again."""
+
+    def __init__(self, max_entries: int = CLOSED_RUN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, rows):
+        with self._lock:
+            self._entries[key] = rows
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+closed_run_cache = ClosedRunCache()
+
+
+def iter_scan_rows(model, screener_run_id=None, screener_date=None, screener=None, stock_name=None,
+                   batch_size: int = SCAN_QUERY_BATCH_SIZE):
+    """Stream a scan table's rows as typed row tuples, filtered on the indexed columns."""
+    stmt = select(*model.__table__.columns)
+    if screener_run_id is not None:
+        stmt = stmt.where(model.screener_run_id == screener_run_id)
+    if screener_date is not None:
+        stmt = stmt.where(model.screener_date == _as_date(screener_date))
+    if screener is not None:
+        stmt = stmt.where(model.screener == screener)
+    if stock_name is not None:
+        stmt = stmt.where(model.stock_name == stock_name.strip().upper())
+    with get_engine().connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+        yield from result
+
+
+def fetch_scan_rows(model, screener_run_id=None, screener_date=None, screener=None, stock_name=None) -> list:
+    """
+    Return a scan table's rows for a run id and/or date, optionally narrowed to one screener or stock.
+    Only queries pinned to an explicit past screener_date are cached: run ids are reused across
+    days, so a run-id lookup can gain rows at any time.
+    """
+    stock_name = stock_name.strip().upper() if stock_name is not None else None
+    screener_date = _as_date(screener_date)
+    cacheable = screener_date is not None and screener_date < _today()
+    key = (model.__tablename__, screener_run_id, screener_date, screener, stock_name)
+    if cacheable:
+        cached = closed_run_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+    rows = list(iter_scan_rows(model, screener_run_id, screener_date, screener, stock_name))
+    if cacheable:
+        closed_run_cache.put(key, tuple(rows))
+    return rows
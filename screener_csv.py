@@ -0,0 +1,39 @@
+import os
+import csv
+import shutil
+import tempfile
+from contextlib import contextmanager
+from itertools import islice
+
+SCREENER_WRITE_CHUNK_SIZE = int(os.getenv("SCREENER_WRITE_CHUNK_SIZE", "500"))
+
+
+@contextmanager
+def run_download_dir(prefix: str):
+    """Create a private download directory for one scraper run and remove it afterwards."""
+    download_dir = tempfile.mkdtemp(prefix=prefix)
+    try:
+        yield download_dir
+    finally:
+        shutil.rmtree(download_dir, ignore_errors=True)
+
+
+def iter_csv_rows(csv_file, logger):
+    """Yield CSV rows one at a time instead of loading the whole file."""
+    logger.info(f"Reading {csv_file}..")
+    with open(csv_file, mode='r', newline='', encoding='utf-8') as file:
+        count = 0
+        for row in csv.reader(file):
+            count += 1
+            yield row
+    logger.info(f"Reading completed ({count} rows)")
+
+
+def chunked(iterable, size: int = SCREENER_WRITE_CHUNK_SIZE):
+    """Yield lists of up to `size` items from `iterable`."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
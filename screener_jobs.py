@@ -0,0 +1,157 @@
+import os
+import threading
+import time
+import uuid
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+IST = pytz.timezone("Asia/Kolkata")
+
+# ✅ Job states
+JOB_QUEUED = "QUEUED"
+JOB_RUNNING = "RUNNING"
+JOB_COMPLETED = "COMPLETED"
+JOB_FAILED = "FAILED"
+JOB_CANCELLED = "CANCELLED"
+
+SCREENER_JOB_WORKERS = int(os.getenv("SCREENER_JOB_WORKERS", "4"))
+SCREENER_JOB_MAX_PENDING = int(os.getenv("SCREENER_JOB_MAX_PENDING", "32"))
+SCREENER_JOB_HISTORY = int(os.getenv("SCREENER_JOB_HISTORY", "500"))
+
+
+def now_ist():
+    return datetime.utcnow().replace(tzinfo=pytz.utc).astimezone(IST)
+
+
+class JobQueueFull(Exception):
+    """Raised when the loader job queue already holds the maximum number of pending jobs."""
+
+
+def summarize_result(value):
+    """Reduce a loader's return value to something the jobs endpoints can serialise: collections become counts."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {str(k): summarize_result(v) for k, v in value.items()}
+    if hasattr(value, "__len__"):
+        return {"count": len(value)}
+    return type(value).__name__
+
+
+class LoaderJob:
+    def __init__(self, job_id: str, name: str):
+        self.job_id = job_id
+        self.name = name
+        self.status = JOB_QUEUED
+        self.submitted_at = now_ist()
+        self.started_at = None
+        self.finished_at = None
+        self.duration_seconds = None
+        self.result = None
+        self.error = None
+        self.log_id = None
+        self._started_perf = None
+        self._future = None
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "name": self.name,
+            "status": self.status,
+            "submitted_at": self.submitted_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S") if self.started_at else None,
+            "finished_at": self.finished_at.strftime("%Y-%m-%d %H:%M:%S") if self.finished_at else None,
+            "duration_seconds": self.duration_seconds,
+            "result": self.result,
+            "error": self.error,
+            "log_id": self.log_id,
+        }
+
+
+class LoaderJobManager:
+    """
+    Runs blocking loader functions on a bounded thread pool so the FastAPI event loop stays free.
+    Keeps the last `history` jobs in memory for status lookups.
+    """
+
+    def __init__(self, max_workers: int = SCREENER_JOB_WORKERS, max_pending: int = SCREENER_JOB_MAX_PENDING,
+                 history: int = SCREENER_JOB_HISTORY):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="screener-job")
+        self._max_pending = max_pending
+        self._history = history
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, fn, *args, **kwargs) -> LoaderJob:
+        """
+        Queue `fn(job, *args, **kwargs)` and return its job record immediately.
+        Raises JobQueueFull when too many jobs are already waiting or running.
+        """
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if j.status in (JOB_QUEUED, JOB_RUNNING))
+            if pending >= self._max_pending:
+                raise JobQueueFull(f"{pending} loader jobs already pending")
+
+            job = LoaderJob(uuid.uuid4().hex, name)
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self._history:
+                oldest_id, oldest = next(iter(self._jobs.items()))
+                if oldest.status in (JOB_QUEUED, JOB_RUNNING):
+                    break
+                self._jobs.pop(oldest_id)
+
+        job._future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job: LoaderJob, fn, args, kwargs):
+        job.status = JOB_RUNNING
+        job.started_at = now_ist()
+        job._started_perf = time.perf_counter()
+        try:
+            job.result = summarize_result(fn(job, *args, **kwargs))
+            job.status = JOB_COMPLETED
+        except Exception as e:
+            job.error = str(e)
+            job.status = JOB_FAILED
+            logger.error(f"Loader job {job.name} ({job.job_id}) failed: {e}", exc_info=True)
+        finally:
+            job.finished_at = now_ist()
+            job.duration_seconds = round(time.perf_counter() - job._started_perf, 3)
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self, status: str = None):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        if status:
+            jobs = [j for j in jobs if j.status == status.upper()]
+        return jobs
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status == JOB_QUEUED and job._future is not None and job._future.cancelled():
+                    job.status = JOB_CANCELLED
+                    job.finished_at = now_ist()
+
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> LoaderJobManager:
+    """Return the process-wide loader job manager, creating it on first use."""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = LoaderJobManager()
+        return _job_manager
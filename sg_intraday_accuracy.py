@@ -1,15 +1,17 @@
 import pytz
 import traceback
 from datetime import datetime, date
-from sqlalchemy import Column, String, Float, Integer, DateTime, Text, Boolean, Date, Index, create_engine, insert, select
+from sqlalchemy import Column, String, Float, Integer, DateTime, Text, Boolean, Date, Index, insert, select
 from sqlalchemy.dialects.mysql import DATETIME
-from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base
 from dotenv import load_dotenv
 from dateutil import parser
 import logging
 import os
+from scan_queries import scan_indexes, create_scan_indexes, fetch_scan_rows, iter_scan_rows
+from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.management.database_manager import Base
+from db_engine import get_engine, get_db_session
+from screener_csv import chunked, SCREENER_WRITE_CHUNK_SIZE
 
-Base = declarative_base()
 # Setup logging
 load_dotenv()
 IST = pytz.timezone("Asia/Kolkata")
@@ -20,31 +22,12 @@ def now_ist():
 def today_ist():
     return now_ist().date()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(
-    DATABASE_URL,
-    echo=True,  # Set to False in production
-    pool_size=10,
-    max_overflow=5,
-    pool_recycle=1800,
-    pool_pre_ping=True,
-)
-
 logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
-SessionFactory = sessionmaker(bind=engine)
-SessionScoped = scoped_session(SessionFactory)
-
-def get_db_session():
-    """Dependency to get a database session."""
-    db = SessionScoped()
-    try:
-        yield db
-    finally:
-        db.close()
 
 
 class SgIntradayStockAccuracy(Base):
     __tablename__ = "sg_intraday_accuracy_signals"
+    __table_args__ = scan_indexes("sg_intraday_accuracy_signals")
     id = Column(Integer, nullable=True, primary_key=True, autoincrement=True)
     screener_run_id = Column(String(160), nullable=True)
     screener_date = Column(Date, nullable=True)
@@ -68,47 +51,60 @@ class SgIntradayStockAccuracy(Base):
 
 
 class SgIntradayStockAccuracyRepository:
+    @staticmethod
+    def _to_mapping(row):
+        return {
+            "id": row[0],
+            "screener_run_id": row[1],
+            "screener_date": row[2],
+            "screener_type": row[3],
+            "screener": row[4],
+            "stock_name": row[5],
+            "trade_type": row[6],
+            "ltp": row[7],
+            "volume": row[8],
+            "deviation_from_pivots": row[9],
+            "sector": row[10],
+            "screener_rank": row[11]
+        }
+
     def insert(self, row):
-        with engine.connect() as conn:
-            result = conn.execute(
-                insert(SgIntradayStockAccuracy),
-                [
-                    {
-                        "id": row[0],
-                        "screener_run_id": row[1],
-                        "screener_date": row[2],
-                        "screener_type": row[3],
-                        "screener": row[4],
-                        "stock_name": row[5],
-                        "trade_type": row[6],
-                        "ltp": row[7],
-                        "volume": row[8],
-                        "deviation_from_pivots": row[9],
-                        "sector": row[10],
-                        "screener_rank": row[11]
-                    }
-                ]
-            )
-            conn.commit()
+        self.insert_many([row])
 
-def get_data_by_screener_run_id(screener_runid, logger):
+    def insert_many(self, rows, chunk_size: int = SCREENER_WRITE_CHUNK_SIZE) -> int:
+        """Insert rows (any iterable) in one transaction, as multi-row INSERTs of `chunk_size` rows."""
+        written = 0
+        with get_engine().begin() as conn:
+            for chunk in chunked(rows, chunk_size):
+                conn.execute(insert(SgIntradayStockAccuracy).values([self._to_mapping(row) for row in chunk]))
+                written += len(chunk)
+        return written
+
+def get_data_by_screener_run_id(screener_runid, logger, screener=None, stock_name=None):
+    """Return the rows of one screener run as typed row tuples, optionally for one screener or stock."""
     if not screener_runid:
         logger.error("Error: no runid provided.")
-    else:
-        screener_runid_data = select(SgIntradayStockAccuracy).where(SgIntradayStockAccuracy.screener_run_id==screener_runid)
-        logger.info("Data successfully queried.")
-        return screener_runid_data
+        return []
+    rows = fetch_scan_rows(SgIntradayStockAccuracy, screener_run_id=screener_runid, screener=screener, stock_name=stock_name)
+    logger.info(f"Data successfully queried ({len(rows)} rows).")
+    return rows
 
-def get_data_by_screener_date(screener_date, logger):
+def get_data_by_screener_date(screener_date, logger, screener=None, stock_name=None):
+    """Return the rows of one screener date as typed row tuples, optionally for one screener or stock."""
     if not screener_date:
-        logger.error("Error: no runid provided.")
-    else:
-        screener_datetime_data = select(SgIntradayStockAccuracy).where(SgIntradayStockAccuracy.screener_date==screener_date)
-        logger.info("Data successfully queried.")
-        return screener_datetime_data
+        logger.error("Error: no screener date provided.")
+        return []
+    rows = fetch_scan_rows(SgIntradayStockAccuracy, screener_date=screener_date, screener=screener, stock_name=stock_name)
+    logger.info(f"Data successfully queried ({len(rows)} rows).")
+    return rows
+
+def iter_data_by_screener_date(screener_date, screener=None, stock_name=None):
+    """Stream one screener date's rows without holding them all in memory (not cached)."""
+    return iter_scan_rows(SgIntradayStockAccuracy, screener_date=screener_date, screener=screener, stock_name=stock_name)
 
 
 if __name__ == "__main__":
-    Base.metadata.create_all(engine)
+    Base.metadata.create_all(get_engine())
+    create_scan_indexes(SgIntradayStockAccuracy)
     repo = SgIntradayStockAccuracy()
     print("All operations done. Check MySQL to verify.")
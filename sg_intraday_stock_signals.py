@@ -3,12 +3,22 @@ import traceback
 import os
 from typing import Union,List
 from datetime import datetime
-from sqlalchemy import Column, String, Float, Integer, DateTime, Boolean, Text, Date, Index
+from sqlalchemy import Column, String, Float, Integer, DateTime, Boolean, Text, Date, Index, ForeignKey, func, text
 from sqlalchemy.dialects.mysql import DATETIME
+from sqlalchemy.exc import IntegrityError
 from dotenv import load_dotenv
 from dateutil import parser
 from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.management.database_manager import get_db_session, Base
 from datetime import date
+from db_unit_of_work import unit_of_work
+from milestone_tags import (
+    SgIntradaySignalMilestoneTags,
+    record_milestone_tags,
+    find_signal_ids_by_tags,
+    get_milestone_tags,
+    delete_milestone_tags,
+    backfill_milestone_tags,
+)
 import logging
 # suppress SQL text logging
 logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
@@ -45,7 +55,7 @@ class SgIntradayScreenerSignals(Base):
     run_id = Column(Text, nullable=True)  # ✅ Nullable
     run_history = Column(Text, nullable=True)  # ✅ Nullable
     strategy = Column(String(100), nullable=True)  # ✅ Nullable
-    stock_type = Column(String(100), nullable=True)  # ✅ Nullable
+    stock_type = Column(String(100), nullable=False, default="", server_default="")  # ✅ Non-Nullable: part of the unique key, and MySQL lets NULLs repeat
     tags = Column(String(2000), nullable=True)  # ✅ Nullable
     signal_count = Column(Integer, nullable=True, default=1)  # ✅ Nullable
     ltp = Column(Float, nullable=True)  # ✅ Nullable
@@ -75,17 +85,97 @@ class SgIntradayScreenerSignals(Base):
     bullish_milestone_tags = Column(String(2500), nullable=True)  # ✅ New Column
     bearish_milestone_tags = Column(String(2500), nullable=True)  # ✅ New Column
     updated_time = Column(DateTime, default=now_ist, onupdate=now_ist)  # ✅ Nullable
-    """
     __table_args__ = (
         Index('unique_stock_entry', 'screener', 'screener_date', 'stock_name', 'trade_type', 'stock_type', unique=True),
     )
+
+### **✅ One row per screener run that reported a signal (append-only)**
+class SgIntradayScreenerRunEvents(Base):
+    __tablename__ = "sg_intraday_screener_run_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    signal_id = Column(Integer, ForeignKey("sg_intraday_screener_signals.id", ondelete="CASCADE"), nullable=False)
+    screener_date = Column(Date, nullable=False)
+    stock_name = Column(String(50), nullable=False)
+    run_time = Column(DATETIME, nullable=False)
+    tags = Column(String(500), nullable=True)
+    ltp = Column(Float, nullable=True)
+    price_change = Column(Float, nullable=True)
+    __table_args__ = (
+        Index('ix_run_events_signal_time', 'signal_id', 'run_time'),
+        Index('ix_run_events_stock_date_time', 'stock_name', 'screener_date', 'run_time'),
+    )
+
+# Columns the upsert reads back for rows that already exist
+UPSERT_MERGE_COLUMNS = (
+    SgIntradayScreenerSignals.id,
+    SgIntradayScreenerSignals.stock_name,
+    SgIntradayScreenerSignals.trade_type,
+    SgIntradayScreenerSignals.signal_count,
+)
+
+def build_run_projections(events) -> dict:
+    """
+    Rebuild the legacy run_history and tags strings from a signal's run events, ordered by run_time.
+    The first event is the sighting that created the signal; later ones are repeat hits.
     """
+    if not events:
+        return {"run_history": None, "tags": None}
+    first, repeats = events[0], events[1:]
+    labels = [e.run_time.strftime('%H:%M') for e in repeats]
+    tags = first.tags
+    for label, e in zip(labels, repeats):
+        tags = f"{tags}, {label}-{e.tags}" if tags else f"{label}-{e.tags}"
+    return {
+        "run_history": ", ".join(f"{label}-RUN" for label in labels) or None,
+        "tags": tags,
+    }
+
+UNIQUE_STOCK_ENTRY_COLUMNS = ("screener", "screener_date", "stock_name", "trade_type", "stock_type")
+
+def create_unique_stock_entry_index() -> int:
+    """
+    Migration: make stock_type NOT NULL, remove duplicate signals (keeping the oldest of each and
+    moving the duplicates' run events onto it), then create the unique_stock_entry index if it is
+    missing. Returns the number of duplicate rows deleted.
+    """
+    from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.management.database_manager import engine
+    signals = SgIntradayScreenerSignals.__tablename__
+    events = SgIntradayScreenerRunEvents.__tablename__
+    same_key = " AND ".join(f"keep.{c} = dup.{c}" for c in UNIQUE_STOCK_ENTRY_COLUMNS)
+    SgIntradayScreenerRunEvents.__table__.create(bind=engine, checkfirst=True)
+    SgIntradaySignalMilestoneTags.__table__.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(text(f"UPDATE {signals} SET stock_type = '' WHERE stock_type IS NULL"))
+        conn.execute(text(f"ALTER TABLE {signals} MODIFY stock_type VARCHAR(100) NOT NULL DEFAULT ''"))
+        conn.execute(text(
+            f"UPDATE {events} e JOIN {signals} dup ON e.signal_id = dup.id "
+            f"JOIN (SELECT MIN(id) AS id, {', '.join(UNIQUE_STOCK_ENTRY_COLUMNS)} FROM {signals} "
+            f"GROUP BY {', '.join(UNIQUE_STOCK_ENTRY_COLUMNS)}) keep ON {same_key} AND keep.id <> dup.id "
+            f"SET e.signal_id = keep.id"
+        ))
+        deleted = conn.execute(text(
+            f"DELETE dup FROM {signals} dup JOIN {signals} keep ON {same_key} AND keep.id < dup.id"
+        )).rowcount
+        conn.execute(text(
+            f"DELETE FROM {SgIntradaySignalMilestoneTags.__tablename__} "
+            f"WHERE signal_id NOT IN (SELECT id FROM {signals})"
+        ))
+    print(f"🧹 Removed {deleted} duplicate signal rows")
+    for index in SgIntradayScreenerSignals.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+        print(f"✅ Index {index.name} is in place.")
+    return deleted
 
 ### **✅ Repository Class with `is_processed` Support**
 class SgIntradayScreenerSignalsRepository:
     def __init__(self):
-        """Creates a new session internally so that it does not need to be passed explicitly."""
-        self.session = next(get_db_session())
+        """Sessions are checked out per operation, so one instance can be shared across threads."""
+        self._session_factory = get_db_session
+
+    def unit_of_work(self, commit: bool = True):
+        """Context manager yielding a session for one operation; commits on success and releases the connection."""
+        return unit_of_work(self._session_factory, commit=commit)
 
     def to_ist(self, dt_str):
         """Convert a datetime string (various formats) to IST datetime object."""
@@ -98,89 +188,202 @@ class SgIntradayScreenerSignalsRepository:
             print(f"❌ Error converting {dt_str} to IST:", e)
             return None
 
+    def _prepare_record(self, column_names, row, screener: str, screener_date: date) -> dict:
+        record = {column_names[i]: row[i] if row[i] else None for i in range(len(column_names))}
+        record["screener"] = screener
+        record["is_active"] = True
+        record["is_processed"] = False
+        record["screener_date"] = screener_date
+
+        if "screener_run_time" in record:
+            record["screener_run_time"] = self.to_ist(record["screener_run_time"])
+        if "break_time" in record:
+            record["break_time"] = self.to_ist(record["break_time"])
+
+        # Convert numeric fields safely
+        for key in ["price_change", "stock_momentum_score", "ltp", "index_contribution", "break_price", "S3", "S2", "S1", "R1", "R2", "R3"]:
+            if key in record and record[key] is not None:
+                try:
+                    record[key] = float(record[key])
+                except ValueError:
+                    record[key] = None
+
+        # ✅ Standardize stock_name (strip spaces & uppercase)
+        record["stock_name"] = record["stock_name"].strip().upper()
+        # ✅ stock_type is part of the unique key, so never NULL
+        record["stock_type"] = record.get("stock_type") or ""
+        return record
+
+    @staticmethod
+    def _merge_into(entry: dict, record: dict):
+        """Apply one more sighting of a signal to `entry` (an existing row or a pending insert)."""
+        entry["ltp"] = record.get("ltp", entry.get("ltp"))
+        entry["price_change"] = record.get("price_change", entry.get("price_change"))
+        entry["updated_time"] = now_ist()
+        entry["signal_count"] = (entry.get("signal_count") or 1) + 1
+        entry["is_processed"] = False
+
+    def _apply_upsert(self, session, records: List[dict], screener: str, screener_date: date):
+        # ✅ One query for every row this screener already has today
+        existing = {
+            (row.stock_name, row.trade_type): dict(row._mapping)
+            for row in session.query(*UPSERT_MERGE_COLUMNS).filter(
+                SgIntradayScreenerSignals.screener == screener,
+                SgIntradayScreenerSignals.screener_date == screener_date,
+            )
+        }
+
+        updates = {}
+        inserts = {}
+        for record in records:
+            key = (record["stock_name"], record["trade_type"])
+            if key in existing:
+                updates[key] = existing[key]
+                self._merge_into(existing[key], record)
+            elif key in inserts:
+                self._merge_into(inserts[key], record)
+            else:
+                inserts[key] = record
+
+        if updates:
+            session.bulk_update_mappings(SgIntradayScreenerSignals, list(updates.values()))
+        if inserts:
+            session.bulk_insert_mappings(SgIntradayScreenerSignals, list(inserts.values()))
+            # ✅ Fetch the new ids in one query so the run events can reference them
+            signal_ids = {key: row["id"] for key, row in existing.items()}
+            signal_ids.update(
+                ((row.stock_name, row.trade_type), row.id)
+                for row in session.query(
+                    SgIntradayScreenerSignals.id, SgIntradayScreenerSignals.stock_name, SgIntradayScreenerSignals.trade_type
+                ).filter(
+                    SgIntradayScreenerSignals.screener == screener,
+                    SgIntradayScreenerSignals.screener_date == screener_date,
+                    SgIntradayScreenerSignals.stock_name.in_({key[0] for key in inserts}),
+                )
+            )
+        else:
+            signal_ids = {key: row["id"] for key, row in existing.items()}
+
+        # ✅ Every sighting is one constant-size event row
+        session.bulk_insert_mappings(SgIntradayScreenerRunEvents, [
+            {
+                "signal_id": signal_ids[(record["stock_name"], record["trade_type"])],
+                "screener_date": screener_date,
+                "stock_name": record["stock_name"],
+                "run_time": record.get("screener_run_time") or now_ist(),
+                "tags": record.get("tags"),
+                "ltp": record.get("ltp"),
+                "price_change": record.get("price_change"),
+            }
+            for record in records
+        ])
+
+        # ✅ Milestone tags merge as a set insert into the (signal_id, tag_id) join table
+        record_milestone_tags(session, SgIntradaySignalMilestoneTags, [
+            dict(record, signal_id=signal_ids[(record["stock_name"], record["trade_type"])]) for record in records
+        ])
+        return len(inserts), len(updates)
+
     ### **✅ Modified Upsert Function with `is_processed` Column**
     def upsert(self, data: List[List[str]], screener: str):
         """
         Insert new records if they do not exist. If they exist, update them.
+        Existing rows for the screener and day are loaded in one query, merged in memory and
+        written back with one bulk update and one bulk insert. Each sighting is also appended to
+        sg_intraday_screener_run_events; run_history/tags are built from those events on read.
+        Milestone tags are kept in sg_intraday_screener_signal_tags; see get_milestone_tags.
         """
         try:
-            self.session.rollback()  # ✅ Ensure no pending transactions
-
+            screener_date = today_ist()
             column_names = data[0]
-            for row in data[1:]:
-                record = {column_names[i]: row[i] if row[i] else None for i in range(len(column_names))}
-                record["screener"] = screener
-                record["is_active"] = True
-                record["is_processed"] = False
-                record["screener_date"] = today_ist()
-
-                if "screener_run_time" in record:
-                    record["screener_run_time"] = self.to_ist(record["screener_run_time"])
-                if "break_time" in record:
-                    record["break_time"] = self.to_ist(record["break_time"])
-
-                # Convert numeric fields safely
-                for key in ["price_change", "stock_momentum_score", "ltp", "index_contribution", "break_price", "S3", "S2", "S1", "R1", "R2", "R3"]:
-                    if key in record and record[key] is not None:
-                        try:
-                            record[key] = float(record[key])
-                        except ValueError:
-                            record[key] = None
-
-                # ✅ Standardize stock_name (strip spaces & uppercase)
-                record["stock_name"] = record["stock_name"].strip().upper()
-
-                # ✅ Log if an entry already exists
-                existing_entry = self.session.query(SgIntradayScreenerSignals).filter_by(
-                    screener=record["screener"],
-                    screener_date=record["screener_date"],
-                    stock_name=record["stock_name"],
-                    trade_type=record["trade_type"]
-                ).first()
-
-                if existing_entry:
-                    print(f"🔄 Updating existing entry for {record['stock_name']}")
-                    existing_entry.ltp = record.get("ltp", existing_entry.ltp)
-                    existing_entry.price_change = record.get("price_change", existing_entry.price_change)
-                    existing_entry.updated_time = now_ist()
-                    existing_entry.signal_count += 1
-                    existing_entry.is_processed = False
-                    existing_entry.run_history = (
-                        existing_entry.run_history + f", {record['screener_run_time'].strftime('%H:%M')}-RUN"
-                        if existing_entry.run_history else f"{record['screener_run_time'].strftime('%H:%M')}-RUN"
-                    )
-                    existing_entry.tags = (
-                        existing_entry.tags + f", {record['screener_run_time'].strftime('%H:%M')}-{record['tags']}"
-                        if existing_entry.tags else f"{record['screener_run_time'].strftime('%H:%M')}-{record['tags']}"
-                    )
-
-                    # ✅ Handling bullish_milestone_tags
-                    existing_bullish_tags = set(existing_entry.bullish_milestone_tags.split()) if existing_entry.bullish_milestone_tags else set()
-                    new_bullish_tags = set(record.get("bullish_milestone_tags", "").split())
-
-                    # Add only the missing values
-                    updated_bullish_tags = existing_bullish_tags.union(new_bullish_tags)
-                    existing_entry.bullish_milestone_tags = " ".join(updated_bullish_tags) if updated_bullish_tags else None
 
-                    # ✅ Handling bearish_milestone_tags
-                    existing_bearish_tags = set(existing_entry.bearish_milestone_tags.split()) if existing_entry.bearish_milestone_tags else set()
-                    new_bearish_tags = set(record.get("bearish_milestone_tags", "").split())
+            try:
+                with self.unit_of_work() as session:
+                    records = [self._prepare_record(column_names, row, screener, screener_date) for row in data[1:]]
+                    inserted, updated = self._apply_upsert(session, records, screener, screener_date)
+            except IntegrityError:
+                # ✅ Another run inserted the same signals first; reload its rows and merge again
+                print("🔄 Concurrent insert detected, retrying upsert against the latest rows")
+                with self.unit_of_work() as session:
+                    records = [self._prepare_record(column_names, row, screener, screener_date) for row in data[1:]]
+                    inserted, updated = self._apply_upsert(session, records, screener, screener_date)
 
-                    # Add only the missing values
-                    updated_bearish_tags = existing_bearish_tags.union(new_bearish_tags)
-                    existing_entry.bearish_milestone_tags = " ".join(updated_bearish_tags) if updated_bearish_tags else None
-                else:
-                    print(f"➕ Inserting new entry for {record['stock_name']}")
-                    new_entry = SgIntradayScreenerSignals(**record)
-                    self.session.add(new_entry)
-
-            self.session.commit()
-            print("✅ Data upserted successfully!")
+            print(f"✅ Data upserted successfully! ({inserted} inserted, {updated} updated)")
 
         except Exception as e:
             print("❌ Error in upsert operation:")
             traceback.print_exc()
-            self.session.rollback()
+
+    def get_run_projections(self, signal_ids: List[int]) -> dict:
+        """
+        Return {signal_id: {"run_history": ..., "tags": ...}} built from the run events.
+        Signals written before the events table existed have no events; their stored
+        run_history/tags columns are returned as they are.
+        """
+        events_by_signal = {signal_id: [] for signal_id in signal_ids}
+        with self.unit_of_work(commit=False) as session:
+            for event in (
+                session.query(SgIntradayScreenerRunEvents.signal_id, SgIntradayScreenerRunEvents.run_time,
+                              SgIntradayScreenerRunEvents.tags)
+                .filter(SgIntradayScreenerRunEvents.signal_id.in_(signal_ids))
+                .order_by(SgIntradayScreenerRunEvents.signal_id, SgIntradayScreenerRunEvents.run_time,
+                          SgIntradayScreenerRunEvents.id)
+            ):
+                events_by_signal[event.signal_id].append(event)
+            projections = {signal_id: build_run_projections(events) for signal_id, events in events_by_signal.items()}
+
+            # ✅ Legacy rows: fall back to the columns the old upsert maintained
+            legacy_ids = [signal_id for signal_id, events in events_by_signal.items() if not events]
+            if legacy_ids:
+                for row in session.query(
+                    SgIntradayScreenerSignals.id, SgIntradayScreenerSignals.run_history, SgIntradayScreenerSignals.tags
+                ).filter(SgIntradayScreenerSignals.id.in_(legacy_ids)):
+                    projections[row.id] = {"run_history": row.run_history, "tags": row.tags}
+        return projections
+
+    def get_milestone_tags(self, signal_ids: List[int]) -> dict:
+        """Return {signal_id: {"bullish_milestone_tags": ..., "bearish_milestone_tags": ...}} from the tag index."""
+        with self.unit_of_work() as session:
+            return get_milestone_tags(session, SgIntradaySignalMilestoneTags, signal_ids)
+
+    def find_signals_by_tags(
+            self,
+            screener_date: Union[date, str],
+            all_of: List[str] = (),
+            any_of: List[str] = (),
+            polarity: str = None,
+    ) -> List[SgIntradayScreenerSignals]:
+        """
+        Fetch the signals on a date that carry every tag in `all_of` and at least one tag in `any_of`.
+        `polarity` ("bullish" / "bearish") restricts the match to one kind of milestone tag.
+        """
+        if isinstance(screener_date, str):
+            screener_date = parser.parse(screener_date).date()
+        with self.unit_of_work(commit=False) as session:
+            signal_ids = find_signal_ids_by_tags(
+                session, SgIntradaySignalMilestoneTags, screener_date, all_of, any_of, polarity
+            )
+            if not signal_ids:
+                return []
+            return (
+                session.query(SgIntradayScreenerSignals)
+                .filter(SgIntradayScreenerSignals.id.in_(signal_ids))
+                .all()
+            )
+
+    def first_seen(self, stock_name: str, screener_date: Union[date, str]):
+        """Return the earliest run time at which any screener reported `stock_name` on the date, or None."""
+        if isinstance(screener_date, str):
+            screener_date = parser.parse(screener_date).date()
+        with self.unit_of_work(commit=False) as session:
+            return (
+                session.query(func.min(SgIntradayScreenerRunEvents.run_time))
+                .filter(
+                    SgIntradayScreenerRunEvents.stock_name == stock_name.strip().upper(),
+                    SgIntradayScreenerRunEvents.screener_date == screener_date,
+                )
+                .scalar()
+            )
 
     def fetch_signals_by_date_stock_and_screeners(
             self,
@@ -197,15 +400,46 @@ class SgIntradayScreenerSignalsRepository:
         # normalize stock_name
         stock_name = stock_name.strip().upper()
 
-        return (
-            self.session
-            .query(SgIntradayScreenerSignals)
-            .filter(
-                SgIntradayScreenerSignals.screener_date == screener_date,
-                SgIntradayScreenerSignals.stock_name == stock_name,
+        with self.unit_of_work(commit=False) as session:
+            return (
+                session
+                .query(SgIntradayScreenerSignals)
+                .filter(
+                    SgIntradayScreenerSignals.screener_date == screener_date,
+                    SgIntradayScreenerSignals.stock_name == stock_name,
+                )
+                .all()
             )
-            .all()
-        )
+
+    def fetch_levels_for_stocks(
+            self,
+            screener_date: Union[date, str],
+            stock_names: List[str],
+    ) -> dict:
+        """
+        Return {stock_name: level} for the given date from one query over (stock_name, level).
+        When a stock has several signals, the earliest one's level is used.
+        """
+        if isinstance(screener_date, str):
+            screener_date = parser.parse(screener_date).date()
+        names = {name.strip().upper() for name in stock_names}
+        if not names:
+            return {}
+
+        levels = {}
+        with self.unit_of_work(commit=False) as session:
+            rows = (
+                session.query(SgIntradayScreenerSignals.stock_name, SgIntradayScreenerSignals.level)
+                .filter(
+                    SgIntradayScreenerSignals.screener_date == screener_date,
+                    SgIntradayScreenerSignals.stock_name.in_(names),
+                )
+                .order_by(SgIntradayScreenerSignals.id)
+            )
+            for row in rows:
+                levels.setdefault(row.stock_name, row.level)
+        return levels
+
     def delete_by_date_and_type(
             self,
             screener_date: Union[date, str],
@@ -220,22 +454,29 @@ class SgIntradayScreenerSignalsRepository:
             screener_date = parser.parse(screener_date).date()
 
         try:
-            deleted_count = (
-                self.session
-                .query(SgIntradayScreenerSignals)
-                .filter(
-                    SgIntradayScreenerSignals.screener_date == screener_date,
-                    SgIntradayScreenerSignals.screener_type == screener_type
+            with self.unit_of_work() as session:
+                delete_milestone_tags(
+                    session,
+                    SgIntradaySignalMilestoneTags,
+                    session.query(SgIntradayScreenerSignals.id).filter(
+                        SgIntradayScreenerSignals.screener_date == screener_date,
+                        SgIntradayScreenerSignals.screener_type == screener_type,
+                    ),
+                )
+                deleted_count = (
+                    session
+                    .query(SgIntradayScreenerSignals)
+                    .filter(
+                        SgIntradayScreenerSignals.screener_date == screener_date,
+                        SgIntradayScreenerSignals.screener_type == screener_type
+                    )
+                    .delete(synchronize_session='fetch')
                 )
-                .delete(synchronize_session='fetch')
-            )
-            self.session.commit()
             print(f"🗑️ Deleted {deleted_count} records for date={screener_date} and type={screener_type}")
             return deleted_count
 
         except Exception as e:
             print("❌ Error deleting records:", e)
-            self.session.rollback()
             return 0
 
     def delete_by_date_type_and_screeners(
@@ -253,29 +494,40 @@ class SgIntradayScreenerSignalsRepository:
             screener_date = parser.parse(screener_date).date()
 
         try:
-            deleted_count = (
-                self.session
-                .query(SgIntradayScreenerSignals)
-                .filter(
-                    SgIntradayScreenerSignals.screener_date == screener_date,
-                    SgIntradayScreenerSignals.screener_type == screener_type,
+            with self.unit_of_work() as session:
+                delete_milestone_tags(
+                    session,
+                    SgIntradaySignalMilestoneTags,
+                    session.query(SgIntradayScreenerSignals.id).filter(
+                        SgIntradayScreenerSignals.screener_date == screener_date,
+                        SgIntradayScreenerSignals.screener_type == screener_type,
+                    ),
+                )
+                deleted_count = (
+                    session
+                    .query(SgIntradayScreenerSignals)
+                    .filter(
+                        SgIntradayScreenerSignals.screener_date == screener_date,
+                        SgIntradayScreenerSignals.screener_type == screener_type,
+                    )
+                    .delete(synchronize_session='fetch')
                 )
-                .delete(synchronize_session='fetch')
-            )
-            self.session.commit()
             print(f"🗑️ Deleted {deleted_count} records for "
                   f"date={screener_date}, type={screener_type}")
             return deleted_count
 
         except Exception as e:
             print("❌ Error deleting records:", e)
-            self.session.rollback()
             return 0
 
 ### **✅ Main Function with Sample Data**
 if __name__ == "__main__":
     from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.management.database_manager import engine, Base
     Base.metadata.create_all(engine)
+    create_unique_stock_entry_index()
+    with unit_of_work(get_db_session) as session:
+        linked = backfill_milestone_tags(session, SgIntradayScreenerSignals, SgIntradaySignalMilestoneTags)
+    print(f"✅ Backfilled {linked} intraday milestone tag links")
 
     # Create a repository instance
     repo = SgIntradayScreenerSignalsRepository()
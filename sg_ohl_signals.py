@@ -12,6 +12,14 @@ from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.m
     engine,
 )
 
+from milestone_tags import (
+    SgOhlSignalMilestoneTags,
+    record_milestone_tags,
+    find_signal_ids_by_tags,
+    delete_milestone_tags,
+    backfill_milestone_tags,
+)
+
 load_dotenv()
 
 IST = pytz.timezone("Asia/Kolkata")
@@ -94,6 +102,13 @@ class SgOhlSignalsRepository:
                     bearish_milestone_tags=data[19] if len(data) > 19 else None,
                 )
                 session.add(entry)
+                session.flush()
+                record_milestone_tags(session, SgOhlSignalMilestoneTags, [{
+                    "signal_id": entry.id,
+                    "screener_date": entry.screener_date,
+                    "bullish_milestone_tags": entry.bullish_milestone_tags,
+                    "bearish_milestone_tags": entry.bearish_milestone_tags,
+                }])
                 session.commit()
             except Exception as e:
                 session.rollback()
@@ -182,6 +197,56 @@ class SgOhlSignalsRepository:
                 print("Error retrieving data by screener_date and screener:", e)
                 return []
 
+    def find_signals_by_tags(
+            self,
+            screener_date: str | date,
+            all_of: list = (),
+            any_of: list = (),
+            polarity: str | None = None,
+    ):
+        """
+        Returns the OHL rows on a date that carry every tag in `all_of` and at least one tag in
+        `any_of`, looked up through the milestone tag index instead of a LIKE scan.
+        """
+        with self._get_session() as session:
+            try:
+                if isinstance(screener_date, str):
+                    screener_date = parser.parse(screener_date).date()
+                signal_ids = find_signal_ids_by_tags(
+                    session, SgOhlSignalMilestoneTags, screener_date, all_of, any_of, polarity
+                )
+                if not signal_ids:
+                    return []
+                result = session.query(SgOhlSignals).filter(SgOhlSignals.id.in_(signal_ids)).all()
+                return [
+                    [
+                        row.screener_run_id,
+                        row.screener_date,
+                        row.screener_type,
+                        row.screener,
+                        row.stock_name,
+                        row.trade_type,
+                        row.screener_rank,
+                        row.price,
+                        row.change,
+                        row.percentage,
+                        row.momentum,
+                        row.open,
+                        row.deviation_from_pivots,
+                        row.todays_range,
+                        row.ohl,
+                        row.stock_type,
+                        row.weekly_trend,
+                        row.sector,
+                        row.bullish_milestone_tags,
+                        row.bearish_milestone_tags,
+                    ]
+                    for row in result
+                ]
+            except Exception as e:
+                print("Error retrieving data by milestone tags:", e)
+                return []
+
     def update_weekly_trend(
             self,
             screener_date: str | date,
@@ -225,6 +290,14 @@ class SgOhlSignalsRepository:
 
         with self._get_session() as session:
             try:
+                delete_milestone_tags(
+                    session,
+                    SgOhlSignalMilestoneTags,
+                    session.query(SgOhlSignals.id).filter(
+                        SgOhlSignals.screener_date == screener_date,
+                        SgOhlSignals.screener_type == screener_type,
+                    ),
+                )
                 deleted_count = (
                     session
                     .query(SgOhlSignals)
@@ -246,6 +319,9 @@ class SgOhlSignalsRepository:
 
 if __name__ == "__main__":
     Base.metadata.create_all(engine)
+    with next(get_db_session()) as session:
+        linked = backfill_milestone_tags(session, SgOhlSignals, SgOhlSignalMilestoneTags)
+    print(f"✅ Backfilled {linked} OHL milestone tag links")
 
     # Example usage:
     repo = SgOhlSignalsRepository()
@@ -36,6 +36,12 @@ from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.m
     get_db_session, SessionScoped, initialize_global_session, close_global_session, cleanup
 )
 from algo_scripts.algotrade.scripts.trade_utils.time_manager import get_current_ist_time_as_str
+from screener_jobs import get_job_manager, JobQueueFull
+from webdriver_pool import get_driver_pool, close_driver_pool
+from index_symbol_cache import get_index_symbol_cache
+from db_unit_of_work import checkout_stats
+from quote_cache import get_quote_cache
+from quote_coalescer import get_quote_coalescer
 import os
 import atexit
 
@@ -72,6 +78,8 @@ def startup():
 @app.on_event("shutdown")
 def shutdown():
     """Cleanup database connections when the app shuts down."""
+    get_job_manager().shutdown(wait=False)
+    close_driver_pool()
     close_global_session()
     cleanup()
 
@@ -91,311 +99,136 @@ def convert_to_ist(utc_time_str):
     # Format IST time as human-readable string
     return ist_time.strftime("%Y-%m-%d %I:%M:%S %p %Z")
 
-@app.get("/intraday/screener/load_fno_top_rankers")
-async def load_fno_top_rankers():
+def run_screener_job(job, screener_name, loader, *args):
+    """
+    Runs a blocking loader inside a worker thread and records it in ScreenerLogRepository.
+    The screener log id is kept on the job record so the two can be matched up.
+    """
     logger_prefix = "load_screener_"
-    screener_name = "top_gainer_loser"
-    process_logger_name = get_screener_logger_name(logger_prefix,screener_name)
+    process_logger_name = get_screener_logger_name(logger_prefix, screener_name)
     logger = get_trade_actions_dynamic_logger(process_logger_name)  # Dynamic logger
 
     session = next(get_db_session())
     repo = ScreenerLogRepository(session)
     log_entry = repo.start_log(process_logger_name)
+    job.log_id = log_entry.log_id
 
-    logger.info(f"Started Processing {screener_name} at {get_current_ist_time_as_str()}")
+    logger.info(f"Started Processing {screener_name} (job {job.job_id}, log {log_entry.log_id}) at {get_current_ist_time_as_str()}")
     try:
+        result = loader(logger, *args)
 
-        load_fno_top_gainers_losers_headless(logger)
-
-        logger.info(f"Completed Processing {screener_name} at {get_current_ist_time_as_str()}")
+        logger.info(f"Completed Processing {screener_name} (job {job.job_id}) at {get_current_ist_time_as_str()}")
         repo.complete_log(log_entry.log_id, status="COMPLETED")
-        return {"status": f"{screener_name} loaded successfully"}
+        return result
     except Exception as e:
         # mark failure and capture message
         repo.complete_log(log_entry.log_id, status="FAILED", error_message=str(e))
-        logger.error(f"Failed Processing {screener_name}: {e}", exc_info=True)
-        # re-raise or convert to HTTP error
-        raise HTTPException(500, detail=f"{screener_name} failed")
+        logger.error(f"Failed Processing {screener_name} (job {job.job_id}): {e}", exc_info=True)
+        raise
     finally:
         session.close()
 
 
-@app.get("/intraday/screener/fno_toppers/{group_name}")
-async def load_fno_top_rankers(group_name: str):
-    logger_prefix = "load_screener_"
-    screener_name = group_name
-    process_logger_name = get_screener_logger_name(logger_prefix,screener_name)
-    logger = get_trade_actions_dynamic_logger(process_logger_name)  # Dynamic logger
+def enqueue_screener_job(screener_name, loader, *args):
+    """Queues a loader on the job pool and returns the job id without waiting for it."""
+    try:
+        job = get_job_manager().submit(screener_name, run_screener_job, screener_name, loader, *args)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"{screener_name} not queued: {str(e)}")
+    return {"status": f"{screener_name} queued", "job_id": job.job_id}
 
-    session = next(get_db_session())
-    repo = ScreenerLogRepository(session)
-    log_entry = repo.start_log(process_logger_name)
 
-    logger.info(f"Started Processing {screener_name} at {get_current_ist_time_as_str()}")
-    try:
+def load_ohl_signals(logger):
+    buy_signals, sell_signals = get_ohl_stocks_intra_screener(logger)
+    logger.info(f"OHL Buy Signals found: {len(buy_signals)}")
+    return {"buy_signals": len(buy_signals), "sell_signals": len(sell_signals)}
 
-        load_fno_toppers_groupwise_headless(logger,group_name)
 
-        logger.info(f"Completed Processing {screener_name} at {get_current_ist_time_as_str()}")
-        repo.complete_log(log_entry.log_id, status="COMPLETED")
-        return {"status": f"{screener_name} loaded successfully"}
-    except Exception as e:
-        # mark failure and capture message
-        repo.complete_log(log_entry.log_id, status="FAILED", error_message=str(e))
-        logger.error(f"Failed Processing {screener_name}: {e}", exc_info=True)
-        # re-raise or convert to HTTP error
-        raise HTTPException(500, detail=f"{screener_name} failed")
-    finally:
-        session.close()
+@app.get("/intraday/screener/load_fno_top_rankers")
+async def load_fno_top_rankers():
+    return enqueue_screener_job("top_gainer_loser", load_fno_top_gainers_losers_headless)
+
+
+@app.get("/intraday/screener/fno_toppers/{group_name}")
+async def load_fno_top_rankers(group_name: str):
+    return enqueue_screener_job(group_name, load_fno_toppers_groupwise_headless, group_name)
 
 # Endpoint to trigger a limit order action
 @app.get("/intraday/screener/index_performance/loader/")
 async def index_performance_loader_action():
-    logger_prefix = "load_screener_"
-    screener_name = "index_performance"
-    process_logger_name = get_screener_logger_name(logger_prefix,screener_name)
-    logger = get_trade_actions_dynamic_logger(process_logger_name)  # Dynamic logger
-
-    session = next(get_db_session())
-    repo = ScreenerLogRepository(session)
-    log_entry = repo.start_log(process_logger_name)
-
-    logger.info(f"Started Processing {screener_name} at {get_current_ist_time_as_str()}")
-    try:
-        load_index_performance_to_db(logger)
-
-        logger.info(f"Completed Processing {screener_name} at {get_current_ist_time_as_str()}")
-        repo.complete_log(log_entry.log_id, status="COMPLETED")
-        return {"status": f"{screener_name} loaded successfully"}
-    except Exception as e:
-        # mark failure and capture message
-        repo.complete_log(log_entry.log_id, status="FAILED", error_message=str(e))
-        logger.error(f"Failed Processing {screener_name}: {e}", exc_info=True)
-        # re-raise or convert to HTTP error
-        raise HTTPException(500, detail=f"{screener_name} failed")
-    finally:
-        session.close()
+    return enqueue_screener_job("index_performance", load_index_performance_to_db)
 
 @app.get("/intraday/screener/resistance_breakout/loader/")
 async def resistance_breakout_loader_action():
-    logger_prefix = "load_screener_"
-    screener_name = "resistance_breakout"
-    process_logger_name = get_screener_logger_name(logger_prefix,screener_name)
-    logger = get_trade_actions_dynamic_logger(process_logger_name)  # Dynamic logger
-
-    session = next(get_db_session())
-    repo = ScreenerLogRepository(session)
-    log_entry = repo.start_log(process_logger_name)
-
-    logger.info(f"Started Processing {screener_name} at {get_current_ist_time_as_str()}")
-    try:
-
-        get_filtered_sr_breakout_stocks(logger,"RESISTANCE")
-
-        logger.info(f"Completed Processing {screener_name} at {get_current_ist_time_as_str()}")
-        repo.complete_log(log_entry.log_id, status="COMPLETED")
-        return {"status": f"{screener_name} loaded successfully"}
-    except Exception as e:
-        # mark failure and capture message
-        repo.complete_log(log_entry.log_id, status="FAILED", error_message=str(e))
-        logger.error(f"Failed Processing {screener_name}: {e}", exc_info=True)
-        # re-raise or convert to HTTP error
-        raise HTTPException(500, detail=f"{screener_name} failed")
-    finally:
-        session.close()
+    return enqueue_screener_job("resistance_breakout", get_filtered_sr_breakout_stocks, "RESISTANCE")
 
 @app.get("/intraday/screener/support_breakdown/loader/")
 async def support_breakdown_loader_action():
-    logger_prefix = "load_screener_"
-    screener_name = "support_breakdown"
-    process_logger_name = get_screener_logger_name(logger_prefix,screener_name)
-    logger = get_trade_actions_dynamic_logger(process_logger_name)  # Dynamic logger
-
-    session = next(get_db_session())
-    repo = ScreenerLogRepository(session)
-    log_entry = repo.start_log(process_logger_name)
-
-    logger.info(f"Started Processing {screener_name} at {get_current_ist_time_as_str()}")
-    try:
-
-        get_filtered_sr_breakout_stocks(logger,"SUPPORT")
-
-        logger.info(f"Completed Processing {screener_name} at {get_current_ist_time_as_str()}")
-        repo.complete_log(log_entry.log_id, status="COMPLETED")
-        return {"status": f"{screener_name} loaded successfully"}
-    except Exception as e:
-        # mark failure and capture message
-        repo.complete_log(log_entry.log_id, status="FAILED", error_message=str(e))
-        logger.error(f"Failed Processing {screener_name}: {e}", exc_info=True)
-        # re-raise or convert to HTTP error
-        raise HTTPException(500, detail=f"{screener_name} failed")
-    finally:
-        session.close()
+    return enqueue_screener_job("support_breakdown", get_filtered_sr_breakout_stocks, "SUPPORT")
 
 
 @app.get("/intraday/screener/bwis/loader/")
 async def bwis_loader_action():
-    logger_prefix = "load_screener_"
-    screener_name = "bwis"
-    process_logger_name = get_screener_logger_name(logger_prefix,screener_name)
-    logger = get_trade_actions_dynamic_logger(process_logger_name)  # Dynamic logger
-
-    session = next(get_db_session())
-    repo = ScreenerLogRepository(session)
-    log_entry = repo.start_log(process_logger_name)
-
-    logger.info(f"Started Processing {screener_name} at {get_current_ist_time_as_str()}")
-    try:
-
-        get_intraday_screener_bwis(logger)
-
-        logger.info(f"Completed Processing {screener_name} at {get_current_ist_time_as_str()}")
-        repo.complete_log(log_entry.log_id, status="COMPLETED")
-        return {"status": f"{screener_name} loaded successfully"}
-    except Exception as e:
-        # mark failure and capture message
-        repo.complete_log(log_entry.log_id, status="FAILED", error_message=str(e))
-        logger.error(f"Failed Processing {screener_name}: {e}", exc_info=True)
-        # re-raise or convert to HTTP error
-        raise HTTPException(500, detail=f"{screener_name} failed")
-    finally:
-        session.close()
+    return enqueue_screener_job("bwis", get_intraday_screener_bwis)
 
 @app.get("/intraday/screener/sector_performance/loader/")
 async def sector_performance_loader_action():
-    logger_prefix = "load_screener_"
-    screener_name = "sector_performance"
-    process_logger_name = get_screener_logger_name(logger_prefix, screener_name)
-    logger = get_trade_actions_dynamic_logger(process_logger_name)  # Dynamic logger
-
-    session = next(get_db_session())
-    repo = ScreenerLogRepository(session)
-    log_entry = repo.start_log(process_logger_name)
-
-    logger.info(f"Started Processing {screener_name} at {get_current_ist_time_as_str()}")
-    try:
-        load_sector_performance_to_db(logger) # Call the modified function
-
-        logger.info(f"Completed Processing {screener_name} at {get_current_ist_time_as_str()}")
-        repo.complete_log(log_entry.log_id, status="COMPLETED")
-        return {"status": f"{screener_name} loaded successfully"}
-    except Exception as e:
-        # mark failure and capture message
-        repo.complete_log(log_entry.log_id, status="FAILED", error_message=str(e))
-        logger.error(f"Failed Processing {screener_name}: {e}", exc_info=True)
-        # re-raise or convert to HTTP error
-        raise HTTPException(status_code=500, detail=f"{screener_name} processing failed: {str(e)}")
-    finally:
-        session.close()
+    return enqueue_screener_job("sector_performance", load_sector_performance_to_db)
 
 @app.get("/intraday/screener/index_contributor/loader/")
 async def index_contributor_loader_action():
-    logger_prefix = "load_screener_"
-    screener_name = "index_contributor"
-    process_logger_name = get_screener_logger_name(logger_prefix, screener_name)
-    logger = get_trade_actions_dynamic_logger(process_logger_name)  # Dynamic logger
+    return enqueue_screener_job("index_contributor", get_intraday_screener_index_contributors)
 
-    session = next(get_db_session())
-    repo = ScreenerLogRepository(session)
-    log_entry = repo.start_log(process_logger_name)
+@app.get("/intraday/screener/sector_advance_decline/loader/")
+async def sector_advance_decline_loader_action():
+    return enqueue_screener_job("sector_advance_decline", load_sector_advance_decline_to_db)
 
-    logger.info(f"Started Processing {screener_name} at {get_current_ist_time_as_str()}")
-    try:
-        get_intraday_screener_index_contributors(logger) # Call the modified function
+@app.get("/intraday/screener/open_high_low/loader/")
+async def open_high_low_loader_action():
+    return enqueue_screener_job("open_high_low", load_ohl_signals)
 
-        logger.info(f"Completed Processing {screener_name} at {get_current_ist_time_as_str()}")
-        repo.complete_log(log_entry.log_id, status="COMPLETED")
-        return {"status": f"{screener_name} loaded successfully to Database"}
-    except Exception as e:
-        # mark failure and capture message
-        repo.complete_log(log_entry.log_id, status="FAILED", error_message=str(e))
-        logger.error(f"Failed Processing {screener_name}: {e}", exc_info=True)
-        # re-raise or convert to HTTP error
-        raise HTTPException(status_code=500, detail=f"{screener_name} processing failed: {str(e)}")
-    finally:
-        session.close()
+@app.get("/intraday/screener/intraday_alerts/loader/")
+async def intraday_alerts_loader_action():
+    return enqueue_screener_job("intraday_alerts", get_intraday_stock_alerts)
 
-@app.get("/intraday/screener/sector_advance_decline/loader/")
-async def sector_advance_decline_loader_action():
-    logger_prefix = "load_screener_"
-    screener_name = "sector_advance_decline"
-    process_logger_name = get_screener_logger_name(logger_prefix, screener_name)
-    logger = get_trade_actions_dynamic_logger(process_logger_name)  # Dynamic logger
 
-    session = next(get_db_session())
-    repo = ScreenerLogRepository(session)
-    log_entry = repo.start_log(process_logger_name)
+@app.get("/screener_data_loader/jobs")
+def list_screener_jobs(status: str = None):
+    return {"jobs": [job.to_dict() for job in get_job_manager().list_jobs(status)]}
 
-    logger.info(f"Started Processing {screener_name} at {get_current_ist_time_as_str()}")
-    try:
-        load_sector_advance_decline_to_db(logger) # Call the modified function
 
-        logger.info(f"Completed Processing {screener_name} at {get_current_ist_time_as_str()}")
-        repo.complete_log(log_entry.log_id, status="COMPLETED")
-        return {"status": f"{screener_name} loaded successfully"}
-    except Exception as e:
-        # mark failure and capture message
-        repo.complete_log(log_entry.log_id, status="FAILED", error_message=str(e))
-        logger.error(f"Failed Processing {screener_name}: {e}", exc_info=True)
-        # re-raise or convert to HTTP error
-        raise HTTPException(status_code=500, detail=f"{screener_name} processing failed: {str(e)}")
-    finally:
-        session.close()
+@app.get("/screener_data_loader/jobs/{job_id}")
+def get_screener_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"No job found with id {job_id}")
+    return job.to_dict()
 
-@app.get("/intraday/screener/open_high_low/loader/")
-async def open_high_low_loader_action():
-    logger_prefix = "load_screener_"
-    screener_name = "open_high_low"
-    process_logger_name = get_screener_logger_name(logger_prefix, screener_name)
-    logger = get_trade_actions_dynamic_logger(process_logger_name)  # Dynamic logger
 
-    session = next(get_db_session())
-    repo = ScreenerLogRepository(session)
-    log_entry = repo.start_log(process_logger_name)
+@app.get("/screener_data_loader/driver_pool")
+def driver_pool_stats():
+    return get_driver_pool().stats()
 
-    logger.info(f"Started Processing {screener_name} at {get_current_ist_time_as_str()}")
-    try:
-        buy_signals, sell_signals = get_ohl_stocks_intra_screener(logger)
-        logger.info(f"OHL Buy Signals found: {len(buy_signals)}")
 
-        logger.info(f"Completed Processing {screener_name} at {get_current_ist_time_as_str()}")
-        repo.complete_log(log_entry.log_id, status="COMPLETED")
-        return {"status": f"{screener_name} loaded successfully"}
-    except Exception as e:
-        # mark failure and capture message
-        repo.complete_log(log_entry.log_id, status="FAILED", error_message=str(e))
-        logger.error(f"Failed Processing {screener_name}: {e}", exc_info=True)
-        # re-raise or convert to HTTP error
-        raise HTTPException(status_code=500, detail=f"{screener_name} processing failed: {str(e)}")
-    finally:
-        session.close()
+@app.get("/screener_data_loader/db_checkout")
+def db_checkout_stats():
+    return checkout_stats.snapshot()
 
-@app.get("/intraday/screener/intraday_alerts/loader/")
-async def intraday_alerts_loader_action():
-    logger_prefix = "load_screener_"
-    screener_name = "intraday_alerts"
-    process_logger_name = get_screener_logger_name(logger_prefix, screener_name)
-    logger = get_trade_actions_dynamic_logger(process_logger_name)  # Dynamic logger
 
-    session = next(get_db_session())
-    repo = ScreenerLogRepository(session)
-    log_entry = repo.start_log(process_logger_name)
+@app.get("/screener_data_loader/quote_cache")
+def quote_cache_stats():
+    return {**get_quote_cache().stats(), "coalescer": get_quote_coalescer().stats()}
 
-    logger.info(f"Started Processing {screener_name} at {get_current_ist_time_as_str()}")
-    try:
-        get_intraday_stock_alerts(logger)
 
-        logger.info(f"Completed Processing {screener_name} at {get_current_ist_time_as_str()}")
-        repo.complete_log(log_entry.log_id, status="COMPLETED")
-        return {"status": f"{screener_name} loaded successfully"}
-    except Exception as e:
-        # mark failure and capture message
-        repo.complete_log(log_entry.log_id, status="FAILED", error_message=str(e))
-        logger.error(f"Failed Processing {screener_name}: {e}", exc_info=True)
-        # re-raise or convert to HTTP error
-        raise HTTPException(status_code=500, detail=f"{screener_name} processing failed: {str(e)}")
-    finally:
-        session.close()
+@app.get("/screener_data_loader/index_symbol_cache")
+def index_symbol_cache_stats():
+    return get_index_symbol_cache().stats()
+
+
+@app.post("/screener_data_loader/index_symbol_cache/invalidate")
+def invalidate_index_symbol_cache():
+    get_index_symbol_cache().invalidate()
+    return {"status": "Index symbol cache invalidated"}
 
 
 @app.get("/screener_data_loader/health")
@@ -0,0 +1,28 @@
+import importlib
+
+import pytest
+
+database_manager = pytest.importorskip(
+    "algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.management.database_manager"
+)
+
+SCAN_MODULES = ("sg_intraday_accuracy", "sg_intraday_stock_alerts", "sg_momentum_stock_alerts", "scan_queries")
+
+
+@pytest.mark.parametrize("name", SCAN_MODULES)
+def test_scan_modules_use_the_database_manager_engine(name):
+    module = importlib.import_module(name)
+    assert module.get_engine() is database_manager.engine
+
+
+def test_scan_modules_create_no_engine_of_their_own():
+    for name in SCAN_MODULES:
+        module = importlib.import_module(name)
+        assert not hasattr(module, "engine")
+        assert not hasattr(module, "create_engine")
+
+
+def test_repositories_share_one_pool():
+    import tradingview_signals
+    import sg_intraday_accuracy
+    assert sg_intraday_accuracy.get_engine().pool is tradingview_signals.engine.pool
@@ -0,0 +1,89 @@
+import logging
+import threading
+
+import pytest
+
+import fyers_quotes
+from fyers_quotes import StubQuotesClient, fetch_quotes, to_fyers_symbol
+
+logger = logging.getLogger(__name__)
+
+
+class RecordingClient(StubQuotesClient):
+    """Stub that records each request's symbols and fails every request containing one of `failing`."""
+
+    def __init__(self, failing=(), **kwargs):
+        super().__init__(latency=0, **kwargs)
+        self.failing = {to_fyers_symbol(s) for s in failing}
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def quotes(self, data):
+        symbols = data["symbols"].split(",")
+        with self._lock:
+            self.requests.append(symbols)
+        if self.failing & set(symbols):
+            return {"s": "error", "message": "boom"}
+        return super().quotes(data)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(fyers_quotes, "FYERS_QUOTES_RETRY_BACKOFF", 0)
+
+
+def symbols(count):
+    return [f"STOCK{i}" for i in range(count)]
+
+
+def test_symbols_are_split_into_chunks_under_the_limit():
+    client = RecordingClient(max_symbols=50)
+
+    response = fetch_quotes(client, symbols(120), logger, chunk_size=50)
+
+    assert sorted(len(chunk) for chunk in client.requests) == [20, 50, 50]
+    assert len(response["d"]) == 120
+    assert "failed" not in response
+
+
+def test_quotes_are_merged_in_request_order_without_duplicates():
+    client = RecordingClient()
+    requested = symbols(75) + ["stock3", "NSE:STOCK4-EQ"]
+
+    response = fetch_quotes(client, requested, logger, chunk_size=10)
+
+    assert [quote["n"] for quote in response["d"]] == [to_fyers_symbol(s) for s in symbols(75)]
+
+
+def test_only_the_failed_chunk_is_retried():
+    client = RecordingClient(failing=["STOCK25"])
+
+    fetch_quotes(client, symbols(60), logger, chunk_size=20, retries=2)
+
+    failing_chunk = [to_fyers_symbol(f"STOCK{i}") for i in range(20, 40)]
+    assert client.requests.count(failing_chunk) == 3
+    assert len(client.requests) == 5
+
+
+def test_failed_chunk_symbols_are_reported():
+    client = RecordingClient(failing=["STOCK25"])
+
+    response = fetch_quotes(client, symbols(60), logger, chunk_size=20, retries=1)
+
+    assert response["failed"] == [to_fyers_symbol(f"STOCK{i}") for i in range(20, 40)]
+    assert [quote["n"] for quote in response["d"]] == (
+        [to_fyers_symbol(f"STOCK{i}") for i in range(20)] + [to_fyers_symbol(f"STOCK{i}") for i in range(40, 60)]
+    )
+
+
+def test_none_when_every_chunk_fails():
+    client = RecordingClient(failing=["STOCK0", "STOCK10"])
+
+    assert fetch_quotes(client, symbols(20), logger, chunk_size=10, retries=0) is None
+
+
+def test_empty_request_makes_no_call():
+    client = RecordingClient()
+
+    assert fetch_quotes(client, [], logger) == {"s": "ok", "d": []}
+    assert client.requests == []
@@ -0,0 +1,78 @@
+import os
+import logging
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+pytest.importorskip("selenium")
+
+import intraday_screener_http as screener_http
+import intraday_screener_session
+from intraday_screener_fixture_server import start_fixture_server
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "intradayscreener")
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def base_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(intraday_screener_session, "SESSION_CACHE_FILE", str(tmp_path / "session.json"))
+    server, url = start_fixture_server(fixture_dir=FIXTURE_DIR)
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+def test_every_feed_has_a_recorded_fixture():
+    from intraday_screener_fixture_server import fixture_path
+
+    for feed, path in screener_http.ENDPOINT_PATHS.items():
+        assert fixture_path("/" + path, FIXTURE_DIR), feed
+
+
+def test_fetch_index_performance(base_url):
+    rows = screener_http.fetch_index_performance(logger, base_url)
+
+    assert rows == [
+        ["NIFTY 50", 24812.35, "0.42", 31, 19],
+        ["NIFTY BANK", 54108.7, "-0.18", 5, 7],
+        ["NIFTY_FIN_SERVICE", 25960.15, "0.07", 11, 9],
+    ]
+
+
+def test_fetch_scan_rows_streams_csv(base_url):
+    rows = list(screener_http.fetch_scan_rows("accuracy", logger, base_url, needs_auth=False))
+
+    assert rows[0][0] == "Symbol"
+    assert rows[1] == ["SBIN", "812.45", "10234567", "R1 +0.35%", "Banks"]
+    assert len(rows) == 3
+
+
+def test_fetch_scan_rows_lays_out_json_like_the_csv_export(base_url):
+    alerts = list(screener_http.fetch_scan_rows("alerts", logger, base_url, needs_auth=False))
+    momentum = list(screener_http.fetch_scan_rows("momentum", logger, base_url, needs_auth=False))
+
+    assert alerts[1] == ["INFY", "", "", "", "1,512.00 - 1,538.40 (1.7%)", "1531.2"]
+    assert momentum[1][:2] == ["TCS", "3412.6"]
+    assert momentum[1][2] == ""
+    assert len(momentum[1]) == len(screener_http.SCAN_JSON_FIELDS["momentum"])
+
+
+def test_missing_session_raises_when_auth_is_needed(base_url):
+    with pytest.raises(screener_http.HttpFetchUnavailable):
+        screener_http.fetch_scan_rows("alerts", logger, base_url, needs_auth=True)
+
+
+def test_cached_auth_is_sent_per_request(base_url, monkeypatch):
+    monkeypatch.setattr(screener_http, "AUTH_STORAGE_KEY", "token")
+    monkeypatch.setattr(screener_http, "load_cached_session", lambda: {
+        "cookies": [{"name": "sid", "value": "abc", "domain": "127.0.0.1"}],
+        "local_storage": {"token": '"xyz"'},
+    })
+
+    list(screener_http.fetch_scan_rows("alerts", logger, base_url, needs_auth=True))
+
+    session = screener_http.get_http_session()
+    assert "Authorization" not in session.headers
+    assert "sid" not in session.cookies
@@ -0,0 +1,126 @@
+import time
+import logging
+import threading
+
+import quote_coalescer
+from fyers_quotes import to_fyers_symbol
+from quote_coalescer import QuoteCoalescer
+
+logger = logging.getLogger("test-quote-coalescer")
+CLIENT = object()
+
+
+class FakeFetch:
+    """
+    Replaces fetch_quotes. The first call blocks until `release` is set, keeping a fetch in flight
+    so later callers coalesce; symbols in `failing` are reported under "failed".
+    """
+
+    def __init__(self, failing=(), error=None):
+        self.failing = {to_fyers_symbol(s) for s in failing}
+        self.error = error
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, client, symbols, logger):
+        self.calls.append(list(symbols))
+        if len(self.calls) == 1:
+            self.release.wait(5)
+        elif self.error:
+            raise self.error
+        response = {"s": "ok", "d": [{"n": s, "v": {"lp": 1.0}} for s in symbols if s not in self.failing]}
+        failed = [s for s in symbols if s in self.failing]
+        if failed:
+            response["failed"] = failed
+        return response
+
+
+class Caller(threading.Thread):
+    def __init__(self, coalescer, symbols):
+        super().__init__(daemon=True)
+        self.coalescer, self.symbols = coalescer, symbols
+        self.response = self.error = None
+
+    def run(self):
+        try:
+            self.response = self.coalescer.fetch(CLIENT, self.symbols, logger)
+        except Exception as e:
+            self.error = e
+
+
+def wait_for_requests(coalescer, count):
+    deadline = time.monotonic() + 5
+    while coalescer.stats()["requests"] < count:
+        assert time.monotonic() < deadline, "callers never registered"
+        time.sleep(0.001)
+
+
+def run_coalesced(monkeypatch, fake, *symbol_lists):
+    """Start one in-flight fetch, then the callers, which share the next batch; return the callers."""
+    monkeypatch.setattr(quote_coalescer, "fetch_quotes", fake)
+    coalescer = QuoteCoalescer(window_ms=300)
+    first = Caller(coalescer, ["FIRST"])
+    first.start()
+    wait_for_requests(coalescer, 1)
+
+    callers = [Caller(coalescer, symbols) for symbols in symbol_lists]
+    for caller in callers:
+        caller.start()
+        time.sleep(0.01)  # the first caller leads the batch
+    wait_for_requests(coalescer, 1 + len(callers))
+    fake.release.set()
+    for caller in [first, *callers]:
+        caller.join(5)
+    return coalescer, callers
+
+
+def names(response):
+    return [quote["n"] for quote in response["d"]]
+
+
+def test_each_caller_gets_only_its_own_slice(monkeypatch):
+    fake = FakeFetch(failing=["BAD"])
+    coalescer, (a, b) = run_coalesced(monkeypatch, fake, ["SBIN", "INFY"], ["INFY", "TCS", "BAD"])
+
+    assert len(fake.calls) == 2
+    assert fake.calls[1] == [to_fyers_symbol(s) for s in ("SBIN", "INFY", "TCS", "BAD")]
+    assert names(a.response) == [to_fyers_symbol("SBIN"), to_fyers_symbol("INFY")]
+    assert "failed" not in a.response
+    assert names(b.response) == [to_fyers_symbol("INFY"), to_fyers_symbol("TCS")]
+    assert b.response["failed"] == [to_fyers_symbol("BAD")]
+    assert coalescer.stats()["broker_batches"] == 2
+
+
+def test_lone_caller_does_not_wait_for_the_window(monkeypatch):
+    monkeypatch.setattr(quote_coalescer, "fetch_quotes",
+                        lambda client, symbols, logger: {"s": "ok", "d": [{"n": s} for s in symbols]})
+    coalescer = QuoteCoalescer(window_ms=500)
+
+    started = time.perf_counter()
+    response = coalescer.fetch(CLIENT, ["SBIN"], logger)
+
+    assert time.perf_counter() - started < 0.25
+    assert names(response) == [to_fyers_symbol("SBIN")]
+    assert coalescer.stats()["immediate_batches"] == 1
+
+
+def test_followers_get_none_and_log_when_the_shared_fetch_raises(monkeypatch, caplog):
+    fake = FakeFetch(error=RuntimeError("broker down"))
+    with caplog.at_level(logging.ERROR, logger=logger.name):
+        _, (leader, follower) = run_coalesced(monkeypatch, fake, ["SBIN"], ["INFY", "TCS"])
+
+    assert isinstance(leader.error, RuntimeError)
+    assert follower.error is None
+    assert follower.response is None
+    assert "Shared quote fetch for 2 symbols failed: broker down" in caplog.text
+
+
+def test_zero_window_fetches_directly(monkeypatch):
+    fake = FakeFetch()
+    fake.release.set()
+    monkeypatch.setattr(quote_coalescer, "fetch_quotes", fake)
+
+    response = QuoteCoalescer(0).fetch(CLIENT, ["sbin", "SBIN"], logger)
+
+    assert fake.calls == [[to_fyers_symbol("SBIN")]]
+    assert names(response) == [to_fyers_symbol("SBIN")]
@@ -1,14 +1,20 @@
-from sqlalchemy import Column, String, Float, Integer, DateTime, PrimaryKeyConstraint
+from sqlalchemy import Column, String, Float, Integer, DateTime, PrimaryKeyConstraint, Index
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Optional, Dict
 import logging
+import os
+import sys
+import time
 from dotenv import load_dotenv
 import json
 from sqlalchemy.sql import cast
-from sqlalchemy import and_
+from sqlalchemy import and_, or_
 from sqlalchemy import func
 from sqlalchemy import distinct
+from sqlalchemy import tuple_
+from sqlalchemy import text
+from sqlalchemy.dialects import mysql
 from algo_scripts.algotrade.scripts.trading_style.intraday.core.intra_utils.db.management.database_manager import (
     get_db_session,
     Base,
@@ -23,6 +29,14 @@ load_dotenv()
 # Logger setup
 logger = logging.getLogger(__name__)
 
+# Keys per IN (...) query when checking a batch of signals for existing rows
+SIGNAL_KEY_LOOKUP_CHUNK_SIZE = int(os.getenv("TV_SIGNAL_KEY_LOOKUP_CHUNK_SIZE", "500"))
+# Tickers per IN (...) query when checking which stocks have signals on a date
+TICKER_LOOKUP_CHUNK_SIZE = int(os.getenv("TV_SIGNAL_TICKER_LOOKUP_CHUNK_SIZE", "1000"))
+# Rows per page / streaming batch for signal reads; larger requests are capped at MAX_PAGE_SIZE
+DEFAULT_PAGE_SIZE = int(os.getenv("TV_SIGNAL_PAGE_SIZE", "500"))
+MAX_PAGE_SIZE = int(os.getenv("TV_SIGNAL_MAX_PAGE_SIZE", "5000"))
+
 # ✅ Define the TVSignals model
 class TVSignals(Base):
     __tablename__ = "sg_tv_signals"
@@ -47,9 +61,30 @@ class TVSignals(Base):
 
     __table_args__ = (
         PrimaryKeyConstraint('updated_time', 'ticker', name='updated_time_ticker_pk'),
+        # ✅ Day-range scans, per-ticker checks and the (signal_time, ticker, trade_type) dedup key
+        Index('ix_tv_signals_time_ticker_type', 'signal_time', 'ticker', 'trade_type'),
+        # ✅ get_tv_signals_by_criteria: equality columns first, then the signal_time range
+        Index('ix_tv_signals_strategy_type_time', 'strategy', 'trade_type', 'signal_time'),
+        # ✅ Keyset pagination order for iter_tv_signals / get_tv_signals_page; ends with the primary key so it is unique
+        Index('ix_tv_signals_time_pk', 'signal_time', 'updated_time', 'ticker'),
         {"extend_existing": True},  # ✅ Fix for duplicate table issue
     )
 
+
+# Columns returned by the streaming/paginated reads, as plain row tuples instead of ORM objects
+SIGNAL_READ_COLUMNS = (
+    TVSignals.row_id, TVSignals.updated_time, TVSignals.exchange, TVSignals.ticker, TVSignals.trade_type,
+    TVSignals.order_type, TVSignals.quantity, TVSignals.limit_price, TVSignals.signal_time, TVSignals.strategy,
+    TVSignals.candle_interval, TVSignals.alert_name, TVSignals.open_price, TVSignals.close_price,
+    TVSignals.high_price, TVSignals.low_price, TVSignals.response_message,
+)
+
+
+def day_range(date: str):
+    """Return the half-open [start, end) datetime range covering a "YYYY-MM-DD" date."""
+    day_start = datetime.strptime(date, "%Y-%m-%d")
+    return day_start, day_start + timedelta(days=1)
+
 # ✅ Repository class for handling trade signals
 class TVSignalsRepository:
     def __init__(self, db_session: Session = None):
@@ -140,40 +175,82 @@ class TVSignalsRepository:
                 logger.error(f"Error deleting data: {e}", exc_info=True)
                 return {"status": "error", "message": str(e)}
 
-    def get_tv_signals(self, date: Optional[str] = None):
-        """Fetches trade signals from the database, optionally filtering by date."""
+    def _signal_rows_query(self, session, date: Optional[str] = None):
+        query = session.query(*SIGNAL_READ_COLUMNS)
+        if date:
+            day_start, day_end = day_range(date)
+            query = query.filter(TVSignals.signal_time >= day_start, TVSignals.signal_time < day_end)
+        return query.order_by(TVSignals.signal_time, TVSignals.updated_time, TVSignals.ticker)
+
+    def iter_tv_signals(self, date: Optional[str] = None, batch_size: int = DEFAULT_PAGE_SIZE):
+        """
+        Streams trade signals as lightweight row tuples in (signal_time, updated_time, ticker) order,
+        optionally filtering by date. Rows are fetched `batch_size` at a time through a server-side cursor.
+        """
+        batch_size = max(1, min(batch_size, MAX_PAGE_SIZE))
         with self._get_session() as session:
-            try:
-                query = session.query(TVSignals)
-                if date:
-                    date_obj = datetime.strptime(date, "%Y-%m-%d").date()
-                    query = query.filter(func.date(TVSignals.signal_time) == date_obj)
+            query = self._signal_rows_query(session, date).execution_options(stream_results=True)
+            yield from query.yield_per(batch_size)
 
-                result = query.all()
-                return [
-                    {
-                        "updated_time": row.updated_time.strftime("%Y-%m-%d %H:%M:%S"),
-                        "exchange": row.exchange,
-                        "ticker": row.ticker,
-                        "trade_type": row.trade_type,
-                        "order_type": row.order_type,
-                        "quantity": row.quantity,
-                        "limit_price": row.limit_price,
-                        "signal_time": row.signal_time.strftime("%Y-%m-%d %H:%M:%S"),
-                        "strategy": row.strategy,
-                        "candle_interval": row.candle_interval,
-                        "alert_name": row.alert_name,
-                        "open_price": row.open_price,
-                        "close_price": row.close_price,
-                        "high_price": row.high_price,
-                        "low_price": row.low_price,
-                        "response_message": row.response_message
-                    }
-                    for row in result
-                ]
+    def get_tv_signals_page(self, date: Optional[str] = None, after: Optional[tuple] = None,
+                            page_size: int = DEFAULT_PAGE_SIZE):
+        """
+        Fetches one page of trade signals using keyset pagination on (signal_time, updated_time, ticker).
+        row_id is not unique, so the cursor ends with the (updated_time, ticker) primary key instead.
+        :param after: The `next_cursor` of the previous page, or None for the first page.
+        :param page_size: Rows per page, capped at MAX_PAGE_SIZE.
+        :return: Dictionary with the page's row tuples and the cursor of the next page (None on the last page).
+        """
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        with self._get_session() as session:
+            try:
+                query = self._signal_rows_query(session, date)
+                if after:
+                    after_time, after_updated, after_ticker = (
+                        datetime.strptime(value, "%Y-%m-%d %H:%M:%S") if i < 2 and isinstance(value, str) else value
+                        for i, value in enumerate(after)
+                    )
+                    query = query.filter(or_(
+                        TVSignals.signal_time > after_time,
+                        and_(TVSignals.signal_time == after_time, TVSignals.updated_time > after_updated),
+                        and_(TVSignals.signal_time == after_time, TVSignals.updated_time == after_updated,
+                             TVSignals.ticker > after_ticker),
+                    ))
+                rows = query.limit(page_size).all()
+                last = rows[-1] if len(rows) == page_size else None
+                next_cursor = (last.signal_time, last.updated_time, last.ticker) if last else None
+                return {"rows": rows, "next_cursor": next_cursor}
             except Exception as e:
-                logger.error(f"Error retrieving data: {e}", exc_info=True)
-                return []
+                logger.error(f"Error retrieving trade signal page: {e}", exc_info=True)
+                return {"rows": [], "next_cursor": None}
+
+    def get_tv_signals(self, date: Optional[str] = None):
+        """Fetches trade signals from the database, optionally filtering by date."""
+        try:
+            return [
+                {
+                    "updated_time": row.updated_time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "exchange": row.exchange,
+                    "ticker": row.ticker,
+                    "trade_type": row.trade_type,
+                    "order_type": row.order_type,
+                    "quantity": row.quantity,
+                    "limit_price": row.limit_price,
+                    "signal_time": row.signal_time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "strategy": row.strategy,
+                    "candle_interval": row.candle_interval,
+                    "alert_name": row.alert_name,
+                    "open_price": row.open_price,
+                    "close_price": row.close_price,
+                    "high_price": row.high_price,
+                    "low_price": row.low_price,
+                    "response_message": row.response_message
+                }
+                for row in self.iter_tv_signals(date)
+            ]
+        except Exception as e:
+            logger.error(f"Error retrieving data: {e}", exc_info=True)
+            return []
 
     def exists_trade_signal(self, signal_time, ticker, trade_type):
         """Checks if a trade signal already exists in the database."""
@@ -187,32 +264,47 @@ class TVSignalsRepository:
             ).first()
             return existing_entry is not None
 
-    def check_stocks_by_date_and_screener(self, stocks:list, date: str) :
+    def get_signalled_tickers_by_date(self, stocks: list, date: str) -> set:
         """
-        Retrieves unique stock tickers along with their strategies for a given date based on signal_time.
+        Returns the subset of `stocks` that have at least one signal on the given date.
+        The whole list is resolved with IN (...) queries of TICKER_LOOKUP_CHUNK_SIZE tickers.
+        :param stocks: Tickers to check.
         :param date: The date in "YYYY-MM-DD" format.
-        :return: A list of dictionaries containing unique stock tickers and their strategies.
+        :return: A set of matching tickers.
         """
+        tickers = list(dict.fromkeys(stocks))
+        if not tickers:
+            return set()
+        day_start, day_end = day_range(date)
+
         with self._get_session() as session:
-            unique_stocks = []
             try:
-                for ticker in stocks:
-                    date_obj = datetime.strptime(date, "%Y-%m-%d").date()
-                    query = (
+                found = set()
+                for i in range(0, len(tickers), TICKER_LOOKUP_CHUNK_SIZE):
+                    chunk = tickers[i:i + TICKER_LOOKUP_CHUNK_SIZE]
+                    rows = (
                         session.query(distinct(TVSignals.ticker))
-                        .filter(func.DATE(TVSignals.signal_time) == str(date_obj),
-                                TVSignals.ticker == ticker
-                                ).all()
+                        .filter(TVSignals.signal_time >= day_start,
+                                TVSignals.signal_time < day_end,
+                                TVSignals.ticker.in_(chunk))
+                        .all()
                     )
-                    if type(query).__name__ == "list" and len(query)!=0:
-                        unique_stocks.append(query)
-                    else:
-                        pass
-                return unique_stocks
+                    found.update(row[0] for row in rows)
+                return found
 
             except Exception as e:
                 logger.error(f"Error retrieving unique stocks: {e}", exc_info=True)
-                return []
+                return set()
+
+    def check_stocks_by_date_and_screener(self, stocks:list, date: str) :
+        """
+        Retrieves unique stock tickers along with their strategies for a given date based on signal_time.
+        Kept for existing callers; prefer get_signalled_tickers_by_date, which returns a flat set.
+        :param date: The date in "YYYY-MM-DD" format.
+        :return: One [(ticker,)] entry per matching ticker, in the order of `stocks`.
+        """
+        found = self.get_signalled_tickers_by_date(stocks, date)
+        return [[(ticker,)] for ticker in stocks if ticker in found]
 
     def get_tv_signals_by_criteria(self, signal_date: str, trade_type: str, strategy: str):
         """
@@ -224,9 +316,10 @@ class TVSignalsRepository:
         """
         with self._get_session() as session:
             try:
-                date_obj = datetime.strptime(signal_date, "%Y-%m-%d").date()
+                day_start, day_end = day_range(signal_date)
                 query = session.query(TVSignals).filter(
-                    func.DATE(TVSignals.signal_time) == date_obj,
+                    TVSignals.signal_time >= day_start,
+                    TVSignals.signal_time < day_end,
                     TVSignals.trade_type == trade_type,
                     TVSignals.strategy == strategy
                 )
@@ -257,68 +350,157 @@ class TVSignalsRepository:
                 logger.error(f"Error retrieving trade signals by criteria: {e}", exc_info=True)
                 return []
 
+    def _existing_signal_keys(self, session, keys) -> set:
+        """Return the subset of (signal_time, ticker, trade_type) keys already stored, one IN query per chunk."""
+        existing = set()
+        keys = list(keys)
+        for i in range(0, len(keys), SIGNAL_KEY_LOOKUP_CHUNK_SIZE):
+            chunk = keys[i:i + SIGNAL_KEY_LOOKUP_CHUNK_SIZE]
+            rows = (
+                session.query(TVSignals.signal_time, TVSignals.ticker, TVSignals.trade_type)
+                .filter(tuple_(TVSignals.signal_time, TVSignals.ticker, TVSignals.trade_type).in_(chunk))
+                .all()
+            )
+            existing.update((row.signal_time, row.ticker, row.trade_type) for row in rows)
+        return existing
+
     def bulk_insert_trade_signals(self, trade_data_list):
         """
         Bulk inserts trade signals into the database while skipping existing records.
+        Existing (signal_time, ticker, trade_type) keys are fetched for the whole batch at once,
+        and duplicates within the batch are inserted only once.
 
         :param trade_data_list: List of trade signal data lists.
-        :return: Dictionary containing insert status.
+        :return: Dictionary containing insert status and inserted/skipped counts.
         """
         with self._get_session() as session:
             try:
-                new_records = []
-
+                # ✅ Convert timestamps correctly, keeping the first row for each signal key
+                candidates = {}
                 for trade_data in trade_data_list:
-                    # ✅ Convert timestamps correctly
-                    updated_time = datetime.strptime(trade_data[0], "%Y-%m-%d %H:%M:%S")
                     signal_time = datetime.strptime(trade_data[7], "%Y-%m-%d %H:%M:%S")
+                    candidates.setdefault((signal_time, trade_data[2], trade_data[3]), trade_data)
 
-                    # ✅ Skip records that already exist
-                    if self.exists_trade_signal(signal_time, trade_data[2], trade_data[3]):
-                        print(f"Skipping existing record for {trade_data[2]} at {signal_time}")
-                        continue
-
-                    # ✅ Prepare new record for insertion
-                    new_records.append(
-                        TVSignals(
-                            updated_time=updated_time,
-                            exchange=trade_data[1],
-                            ticker=trade_data[2],
-                            trade_type=trade_data[3],
-                            order_type=trade_data[4],
-                            quantity=int(trade_data[5]),
-                            limit_price=float(trade_data[6]),
-                            signal_time=signal_time,
-                            strategy=trade_data[8],
-                            candle_interval=trade_data[9],
-                            alert_name=trade_data[10],
-                            open_price=float(trade_data[11]),
-                            close_price=float(trade_data[12]),
-                            high_price=float(trade_data[13]),
-                            low_price=float(trade_data[14]),
-                            response_message=(trade_data[15])
-                        )
-                    )
+                # ✅ Skip records that already exist
+                existing_keys = self._existing_signal_keys(session, candidates.keys())
+
+                # ✅ Prepare new records for insertion
+                new_records = [
+                    {
+                        "updated_time": datetime.strptime(trade_data[0], "%Y-%m-%d %H:%M:%S"),
+                        "exchange": trade_data[1],
+                        "ticker": trade_data[2],
+                        "trade_type": trade_data[3],
+                        "order_type": trade_data[4],
+                        "quantity": int(trade_data[5]),
+                        "limit_price": float(trade_data[6]),
+                        "signal_time": key[0],
+                        "strategy": trade_data[8],
+                        "candle_interval": trade_data[9],
+                        "alert_name": trade_data[10],
+                        "open_price": float(trade_data[11]),
+                        "close_price": float(trade_data[12]),
+                        "high_price": float(trade_data[13]),
+                        "low_price": float(trade_data[14]),
+                        "response_message": (trade_data[15]),
+                    }
+                    for key, trade_data in candidates.items()
+                    if key not in existing_keys
+                ]
+                skipped = len(trade_data_list) - len(new_records)
 
                 # ✅ Insert new records in bulk
                 if new_records:
-                    session.bulk_save_objects(new_records)
+                    session.bulk_insert_mappings(TVSignals, new_records)
                     session.commit()
-                    print(f"Inserted {len(new_records)} new trade signals successfully.")
-                    return {"status": "success", "message": f"Inserted {len(new_records)} records."}
+                    print(f"Inserted {len(new_records)} new trade signals successfully, skipped {skipped}.")
+                    message = f"Inserted {len(new_records)} records."
                 else:
-                    print("No new records to insert.")
-                    return {"status": "success", "message": "No new records to insert."}
+                    print(f"No new records to insert, skipped {skipped}.")
+                    message = "No new records to insert."
+                return {"status": "success", "message": message, "inserted": len(new_records), "skipped": skipped}
 
             except Exception as error:
                 session.rollback()
                 print(f"Error inserting trade signals: {error}")
-                return {"status": "error", "message": str(error)}
+                return {"status": "error", "message": str(error), "inserted": 0, "skipped": 0}
+
+
+def create_tv_signal_indexes():
+    """Migration: create the sg_tv_signals secondary indexes on an existing table if they are missing."""
+    for index in TVSignals.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+        print(f"Index {index.name} is in place.")
+
+
+def explain_tv_signal_queries(date: str):
+    """
+    Print the MySQL query plans of the date-filtered sg_tv_signals lookups, using the old
+    DATE(signal_time) = ... predicate and the half-open range that replaced it.
+    """
+    day_start, day_end = day_range(date)
+    by_day = lambda q: q.filter(func.date(TVSignals.signal_time) == day_start.date())
+    by_range = lambda q: q.filter(TVSignals.signal_time >= day_start, TVSignals.signal_time < day_end)
+
+    with next(get_db_session()) as session:
+        queries = {
+            "get_tv_signals": lambda f: f(session.query(TVSignals)),
+            "get_tv_signals_by_criteria": lambda f: f(session.query(TVSignals)).filter(
+                TVSignals.trade_type == "BUY", TVSignals.strategy == "PRB"),
+            "get_signalled_tickers_by_date": lambda f: f(session.query(distinct(TVSignals.ticker))).filter(
+                TVSignals.ticker.in_(["SBIN", "RELIANCE", "INFY"])),
+        }
+        for name, build in queries.items():
+            for label, predicate in (("DATE()", by_day), ("range", by_range)):
+                # Compile with named placeholders (IN-lists expanded) and let text() bind them in the
+                # driver's own paramstyle, so the EXPLAIN works whichever MySQL driver is configured
+                compiled = build(predicate).statement.compile(
+                    dialect=mysql.dialect(paramstyle="named"), compile_kwargs={"render_postcompile": True})
+                plan = session.execute(text(f"EXPLAIN {compiled}"), compiled.params).mappings().all()
+                for row in plan:
+                    print(f"{name} [{label}]: type={row.get('type')} key={row.get('key')} "
+                          f"rows={row.get('rows')} extra={row.get('Extra')}")
+
+
+def benchmark_bulk_insert(batch_sizes=(50, 500, 5000)):
+    """
+    Time bulk_insert_trade_signals for increasingly large batches of dummy signals, inserting each
+    batch twice so both the insert and the all-skipped path are measured, then delete the rows.
+    """
+    repo = TVSignalsRepository()
+    base_time = datetime.now().replace(microsecond=0)
+    for size in batch_sizes:
+        batch = []
+        for i in range(size):
+            ts = (base_time + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S")
+            batch.append([ts, "BENCH_EX", f"BENCH_{i}", "BUY", "LIMIT", 1, 1.0, ts, "bench_strategy", "1m",
+                          "bench_alert", 1.0, 1.0, 1.0, 1.0, "bench"])
+
+        for attempt in ("insert", "skip"):
+            started = time.perf_counter()
+            result = repo.bulk_insert_trade_signals(batch)
+            elapsed = time.perf_counter() - started
+            print(f"{size:>6} rows ({attempt}): {elapsed * 1000:.1f} ms, "
+                  f"{elapsed / size * 1e6:.1f} us/row, inserted={result['inserted']} skipped={result['skipped']}")
+
+        with repo._get_session() as session:
+            session.query(TVSignals).filter(TVSignals.exchange == "BENCH_EX").delete()
+            session.commit()
 
 
 if __name__ == "__main__":
     Base.metadata.create_all(engine)
 
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_bulk_insert()
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == "migrate":
+        create_tv_signal_indexes()
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == "explain":
+        explain_tv_signal_queries(sys.argv[2] if len(sys.argv) > 2 else datetime.now().strftime("%Y-%m-%d"))
+        sys.exit(0)
+
     # Example usage:
     repo = TVSignalsRepository()
 
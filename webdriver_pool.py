@@ -0,0 +1,199 @@
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import logging
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+CHROME_POOL_SIZE = int(os.getenv("CHROME_POOL_SIZE", "2"))
+CHROME_POOL_MAX_USES = int(os.getenv("CHROME_POOL_MAX_USES", "25"))
+CHROME_POOL_ACQUIRE_TIMEOUT = int(os.getenv("CHROME_POOL_ACQUIRE_TIMEOUT", "120"))
+
+# Called with every driver the pool quits, so per-driver state kept elsewhere can be dropped
+_discard_callbacks = []
+
+
+def on_driver_discarded(callback):
+    _discard_callbacks.append(callback)
+
+
+def default_chrome_options(user_data_dir: str):
+    chrome_options = webdriver.ChromeOptions()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+    return chrome_options
+
+
+def set_download_dir(driver, download_dir: str):
+    """Point Chrome downloads of an already running driver at `download_dir`."""
+    driver.execute_cdp_cmd(
+        "Page.setDownloadBehavior",
+        {"behavior": "allow", "downloadPath": download_dir},
+    )
+
+
+class PooledDriver:
+    def __init__(self, driver, user_data_dir: str):
+        self.driver = driver
+        self.user_data_dir = user_data_dir
+        self.uses = 0
+
+
+class ChromeDriverPool:
+    """
+    Keeps up to `size` warm Chrome drivers and hands them out to scrapers.
+    A driver is health-checked on checkout and recycled after `max_uses` checkouts
+    or as soon as a WebDriverException (other than a wait timeout) escapes while it is in use.
+    """
+
+    def __init__(self, size: int = CHROME_POOL_SIZE, max_uses: int = CHROME_POOL_MAX_USES,
+                 options_factory=default_chrome_options):
+        self.size = size
+        self.max_uses = max_uses
+        self._options_factory = options_factory
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._created = 0
+        self._recycled = 0
+        self._closed = False
+
+    def _create(self) -> PooledDriver:
+        user_data_dir = tempfile.mkdtemp(prefix="chrome-profile")
+        driver = webdriver.Chrome(options=self._options_factory(user_data_dir))
+        driver.set_window_size(1920, 1080)
+        with self._lock:
+            self._created += 1
+        logger.info("🚀 Started pooled Chrome driver")
+        return PooledDriver(driver, user_data_dir)
+
+    def _destroy(self, pooled: PooledDriver):
+        for callback in _discard_callbacks:
+            try:
+                callback(pooled.driver)
+            except Exception as e:
+                logger.warning(f"⚠️ Driver discard callback failed: {e}")
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        shutil.rmtree(pooled.user_data_dir, ignore_errors=True)
+
+    def _recycle(self, pooled: PooledDriver, reason: str):
+        logger.info(f"♻️ Recycling Chrome driver after {pooled.uses} uses ({reason})")
+        with self._lock:
+            self._recycled += 1
+        self._destroy(pooled)
+
+    @staticmethod
+    def _is_healthy(pooled: PooledDriver) -> bool:
+        try:
+            pooled.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def acquire(self) -> PooledDriver:
+        if self._closed:
+            raise RuntimeError("Chrome driver pool is closed")
+        if not self._slots.acquire(timeout=CHROME_POOL_ACQUIRE_TIMEOUT):
+            raise TimeoutError(f"No Chrome driver free after {CHROME_POOL_ACQUIRE_TIMEOUT}s")
+        try:
+            pooled = None
+            while pooled is None:
+                try:
+                    candidate = self._idle.get_nowait()
+                except queue.Empty:
+                    candidate = self._create()
+                    pooled = candidate
+                    break
+                if self._is_healthy(candidate):
+                    pooled = candidate
+                else:
+                    self._recycle(candidate, "failed health check")
+            pooled.uses += 1
+            with self._lock:
+                self._busy += 1
+            return pooled
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, pooled: PooledDriver, broken: bool = False):
+        with self._lock:
+            self._busy -= 1
+        try:
+            if self._closed:
+                self._destroy(pooled)
+            elif broken:
+                self._recycle(pooled, "crashed")
+            elif pooled.uses >= self.max_uses:
+                self._recycle(pooled, "max uses reached")
+            else:
+                self._idle.put(pooled)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self):
+        """Check out a driver for the duration of the `with` block."""
+        pooled = self.acquire()
+        broken = False
+        try:
+            yield pooled.driver
+        except TimeoutException:
+            raise
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.release(pooled, broken=broken)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "max_uses": self.max_uses,
+                "idle": self._idle.qsize(),
+                "busy": self._busy,
+                "created": self._created,
+                "recycled": self._recycled,
+            }
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._destroy(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> ChromeDriverPool:
+    """Return the process-wide Chrome driver pool, creating it on first use."""
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = ChromeDriverPool()
+        return _driver_pool
+
+
+def close_driver_pool():
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is not None:
+            _driver_pool.close()
+            _driver_pool = None